@@ -2,20 +2,123 @@
 
 from __future__ import annotations
 
-from typing import Any
+import asyncio
+import re
+import time
+from typing import Any, TypeVar
+from urllib.parse import urlencode
 
 import httpx
+from pydantic import TypeAdapter
+
+T = TypeVar("T")
 
 BASE_URL = "https://api.the-odds-api.com/v4"
 
+# Props/alt-line fan-out hits one host concurrently; keep sockets warm
+# between refreshes and multiplex over HTTP/2.
+POOL_LIMITS = httpx.Limits(
+    max_keepalive_connections=32, max_connections=64, keepalive_expiry=300,
+)
+
+# Max number of response bodies kept around for conditional re-requests.
+MAX_CONDITIONAL_ENTRIES = 256
+
+_MAX_AGE_RE = re.compile(r"max-age=(\d+)")
+
+
+def _is_free_endpoint(path: str) -> bool:
+    """/sports and /sports/{sport}/events cost no credits and are small.
+
+    Only these are revalidated here; paid odds/props bodies are large and
+    already cached (parsed, with their own TTLs) by the data service.
+    """
+    return path == "/sports" or path.endswith("/events")
+
 
 class CreditInfo:
     """Parsed credit info from response headers."""
 
+    __slots__ = ("remaining", "used")
+
     def __init__(self, remaining: int | None = None, used: int | None = None):
         self.remaining = remaining
         self.used = used
 
+    def update(self, headers: httpx.Headers) -> None:
+        """Refresh in place from x-requests-* headers; missing or bad values become None."""
+        self.remaining = _header_int(headers, "x-requests-remaining")
+        self.used = _header_int(headers, "x-requests-used")
+
+
+def _header_int(headers: httpx.Headers, name: str) -> int | None:
+    value = headers.get(name)
+    if not value:
+        return None
+    try:
+        return int(value)
+    except ValueError:
+        return None
+
+
+class CachedResponse:
+    """Last response body for a URL plus its HTTP cache validators."""
+
+    __slots__ = ("content", "etag", "last_modified", "fresh_until")
+
+    def __init__(
+        self,
+        content: bytes,
+        etag: str | None = None,
+        last_modified: str | None = None,
+        fresh_until: float = 0.0,
+    ):
+        self.content = content
+        self.etag = etag
+        self.last_modified = last_modified
+        self.fresh_until = fresh_until
+
+
+class TokenBucket:
+    """Requests-per-minute limiter; starts full so short bursts go straight out."""
+
+    __slots__ = ("rate", "capacity", "tokens", "updated", "_lock")
+
+    def __init__(self, per_minute: int) -> None:
+        self.rate = per_minute / 60.0  # tokens per second
+        self.capacity = float(per_minute)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    async def acquire(self) -> None:
+        """Take one token, sleeping until one is available."""
+        async with self._lock:
+            self._refill()
+            if self.tokens < 1:
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+                self._refill()
+            self.tokens -= 1
+
+    def drain(self) -> None:
+        """Empty the bucket, e.g. after the server says we're going too fast."""
+        self._refill()
+        self.tokens = 0.0
+
+
+def _max_age(response: httpx.Response) -> int:
+    """Seconds the response may be reused without revalidating."""
+    cache_control = response.headers.get("cache-control", "")
+    if "no-store" in cache_control or "no-cache" in cache_control:
+        return 0
+    match = _MAX_AGE_RE.search(cache_control)
+    return int(match.group(1)) if match else 0
+
 
 class OddsAPIClient:
     """Async HTTP client for the Odds API."""
@@ -24,41 +127,86 @@ class OddsAPIClient:
         self,
         api_key: str,
         transport: httpx.AsyncBaseTransport | None = None,
+        rpm: int = 60,
     ) -> None:
-        self._api_key = api_key
-        kwargs: dict[str, Any] = {"base_url": BASE_URL, "timeout": 15.0}
+        kwargs: dict[str, Any] = {
+            "base_url": BASE_URL,
+            "timeout": 15.0,
+            "http2": True,
+            "limits": POOL_LIMITS,
+            # httpx merges client-level params into every request
+            "params": {"apiKey": api_key},
+        }
         if transport is not None:
             kwargs["transport"] = transport
         self._client = httpx.AsyncClient(**kwargs)
         self.last_credit_info = CreditInfo()
+        self._conditional: dict[str, CachedResponse] = {}
+        self._bucket = TokenBucket(rpm)
 
     async def close(self) -> None:
         await self._client.aclose()
 
     def _parse_credits(self, response: httpx.Response) -> CreditInfo:
-        remaining = response.headers.get("x-requests-remaining")
-        used = response.headers.get("x-requests-used")
-        try:
-            remaining_int = int(remaining) if remaining else None
-        except ValueError:
-            remaining_int = None
-        try:
-            used_int = int(used) if used else None
-        except ValueError:
-            used_int = None
-        info = CreditInfo(remaining=remaining_int, used=used_int)
-        self.last_credit_info = info
+        info = self.last_credit_info
+        info.update(response.headers)
         return info
 
-    async def get(self, path: str, params: dict[str, Any] | None = None) -> Any:
-        """Make an authenticated GET request and return JSON."""
-        params = params or {}
-        params["apiKey"] = self._api_key
-        response = await self._client.get(path, params=params)
+    def _remember(self, key: str, response: httpx.Response) -> None:
+        """Keep a free endpoint's body if the server gave us a way to revalidate or reuse it."""
+        etag = response.headers.get("etag")
+        last_modified = response.headers.get("last-modified")
+        max_age = _max_age(response)
+        if not (etag or last_modified or max_age):
+            self._conditional.pop(key, None)
+            return
+        if key not in self._conditional and len(self._conditional) >= MAX_CONDITIONAL_ENTRIES:
+            self._conditional.pop(next(iter(self._conditional)))
+        self._conditional[key] = CachedResponse(
+            response.content, etag, last_modified, time.monotonic() + max_age,
+        )
+
+    async def get_raw(self, path: str, params: dict[str, Any] | None = None) -> bytes:
+        """GET the raw body, revalidating free endpoints with ETag/Last-Modified.
+
+        A 304 reply costs no credits and no body, so the previous content
+        is returned instead.
+        """
+        key = f"{path}?{urlencode(sorted(params.items()))}" if params else path
+        cached = self._conditional.get(key)
+        if cached is not None and time.monotonic() < cached.fresh_until:
+            return cached.content
+
+        headers: dict[str, str] = {}
+        if cached is not None:
+            if cached.etag:
+                headers["If-None-Match"] = cached.etag
+            if cached.last_modified:
+                headers["If-Modified-Since"] = cached.last_modified
+
+        await self._bucket.acquire()
+        response = await self._client.get(path, params=params, headers=headers)
+        if response.status_code == 429:
+            self._bucket.drain()
+        if response.status_code == 304 and cached is not None:
+            self._parse_credits(response)
+            cached.fresh_until = time.monotonic() + _max_age(response)
+            return cached.content
         response.raise_for_status()
         self._parse_credits(response)
-        return response.json()
+        if _is_free_endpoint(path):
+            self._remember(key, response)
+        return response.content
+
+    async def get_json(
+        self,
+        path: str,
+        params: dict[str, Any] | None = None,
+        *,
+        adapter: TypeAdapter[T],
+    ) -> T:
+        """GET and validate the raw response bytes straight into models.
 
-    async def get_free(self, path: str, params: dict[str, Any] | None = None) -> Any:
-        """GET request for free endpoints (still needs API key)."""
-        return await self.get(path, params)
+        Skips the intermediate dict tree that response.json() would build.
+        """
+        return adapter.validate_json(await self.get_raw(path, params))
@@ -3,18 +3,38 @@
 from __future__ import annotations
 
 import asyncio
+import functools
 import logging
+from collections.abc import Sequence
+
+from pydantic import TypeAdapter
 
 from app.api.client import OddsAPIClient
 from app.api.models import Event, Score, Sport
 
 log = logging.getLogger(__name__)
 
+# Built once per process; validate_json parses bytes directly into models.
+_SPORT_LIST = TypeAdapter(list[Sport])
+_EVENT_LIST = TypeAdapter(list[Event])
+_EVENT = TypeAdapter(Event)
+_SCORE_LIST = TypeAdapter(list[Score])
+
+
+def _join_books(bookmakers: str | Sequence[str]) -> str:
+    """Accept a pre-joined string so callers can skip the per-call join."""
+    return bookmakers if isinstance(bookmakers, str) else ",".join(bookmakers)
+
+
+@functools.lru_cache(maxsize=4)
+def _parse_sports(body: bytes) -> tuple[Sport, ...]:
+    """Validate a /sports body once; identical bodies reuse the models."""
+    return tuple(_SPORT_LIST.validate_json(body))
+
 
 async def get_sports(client: OddsAPIClient) -> list[Sport]:
     """Fetch all available sports (free endpoint)."""
-    data = await client.get_free("/sports")
-    return [Sport(**s) for s in data]
+    return list(_parse_sports(await client.get_raw("/sports")))
 
 
 async def get_odds(
@@ -24,7 +44,7 @@ async def get_odds(
     regions: str = "us",
     markets: str = "h2h,spreads,totals",
     odds_format: str = "american",
-    bookmakers: list[str] | None = None,
+    bookmakers: str | Sequence[str] | None = None,
 ) -> list[Event]:
     """Fetch odds for a sport. Costs credits."""
     params: dict = {
@@ -33,9 +53,10 @@ async def get_odds(
         "oddsFormat": odds_format,
     }
     if bookmakers:
-        params["bookmakers"] = ",".join(bookmakers)
-    data = await client.get(f"/sports/{sport}/odds", params=params)
-    return [Event(**e) for e in data]
+        params["bookmakers"] = _join_books(bookmakers)
+    return await client.get_json(
+        f"/sports/{sport}/odds", params, adapter=_EVENT_LIST
+    )
 
 
 async def get_scores(
@@ -46,14 +67,14 @@ async def get_scores(
 ) -> list[Score]:
     """Fetch live & recent scores. Costs 1 credit per request."""
     params = {"daysFrom": days_from}
-    data = await client.get(f"/sports/{sport}/scores", params=params)
-    return [Score(**s) for s in data]
+    return await client.get_json(
+        f"/sports/{sport}/scores", params, adapter=_SCORE_LIST
+    )
 
 
-async def get_events(client: OddsAPIClient, sport: str) -> list[dict]:
-    """Fetch events for a sport (free endpoint)."""
-    data = await client.get_free(f"/sports/{sport}/events")
-    return data
+async def get_events(client: OddsAPIClient, sport: str) -> list[Event]:
+    """Fetch events for a sport (free endpoint). Events carry no bookmakers."""
+    return await client.get_json(f"/sports/{sport}/events", adapter=_EVENT_LIST)
 
 
 async def get_event_odds(
@@ -64,7 +85,7 @@ async def get_event_odds(
     regions: str = "us",
     markets: str = "player_pass_yds",
     odds_format: str = "american",
-    bookmakers: list[str] | None = None,
+    bookmakers: str | Sequence[str] | None = None,
 ) -> Event:
     """Fetch odds for a single event. Costs credits."""
     params: dict = {
@@ -73,11 +94,10 @@ async def get_event_odds(
         "oddsFormat": odds_format,
     }
     if bookmakers:
-        params["bookmakers"] = ",".join(bookmakers)
-    data = await client.get(
-        f"/sports/{sport}/events/{event_id}/odds", params=params
+        params["bookmakers"] = _join_books(bookmakers)
+    return await client.get_json(
+        f"/sports/{sport}/events/{event_id}/odds", params, adapter=_EVENT
     )
-    return Event(**data)
 
 
 async def get_props_for_events(
@@ -88,19 +108,23 @@ async def get_props_for_events(
     regions: str = "us",
     markets: str = "player_points",
     odds_format: str = "american",
-    bookmakers: list[str] | None = None,
+    bookmakers: str | Sequence[str] | None = None,
     max_concurrent: int = 5,
 ) -> list[Event]:
     """Fetch prop odds for multiple events concurrently.
 
-    Resilient to individual failures — returns only successful results.
+    Runs at most ``max_concurrent`` workers pulling event ids off one shared
+    iterator, so only that many requests (and tasks) are alive at once.
+    Resilient to individual failures — returns only successful results,
+    in the same order as ``event_ids``.
     """
-    sem = asyncio.Semaphore(max_concurrent)
+    pending = iter(enumerate(event_ids))
+    results: list[Event | None] = [None] * len(event_ids)
 
-    async def _fetch_one(eid: str) -> Event | None:
-        async with sem:
+    async def _worker() -> None:
+        for idx, eid in pending:
             try:
-                return await get_event_odds(
+                results[idx] = await get_event_odds(
                     client,
                     sport,
                     eid,
@@ -111,7 +135,7 @@ async def get_props_for_events(
                 )
             except Exception as exc:
                 log.warning("Failed to fetch props for event %s: %s", eid, exc)
-                return None
 
-    results = await asyncio.gather(*[_fetch_one(eid) for eid in event_ids])
+    n_workers = min(max_concurrent, len(event_ids))
+    await asyncio.gather(*[_worker() for _ in range(n_workers)])
     return [e for e in results if e is not None]
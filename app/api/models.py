@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 from datetime import datetime
+from functools import cached_property
 
 from pydantic import BaseModel, Field
 
@@ -23,18 +24,32 @@ class OutcomeOdds(BaseModel):
     description: str | None = None
 
 
+def _parse_iso(value: str | None) -> datetime | None:
+    return datetime.fromisoformat(value) if value else None
+
+
+# last_update is kept as the raw ISO string: there are thousands per odds
+# payload and almost none are ever read, so parse only on access.
 class Market(BaseModel):
     key: str  # h2h, spreads, totals
-    last_update: datetime | None = None
+    last_update: str | None = None
     outcomes: list[OutcomeOdds] = Field(default_factory=list)
 
+    @cached_property
+    def last_update_dt(self) -> datetime | None:
+        return _parse_iso(self.last_update)
+
 
 class Bookmaker(BaseModel):
     key: str
     title: str
-    last_update: datetime | None = None
+    last_update: str | None = None
     markets: list[Market] = Field(default_factory=list)
 
+    @cached_property
+    def last_update_dt(self) -> datetime | None:
+        return _parse_iso(self.last_update)
+
 
 class Event(BaseModel):
     id: str
@@ -45,6 +60,28 @@ class Event(BaseModel):
     away_team: str
     bookmakers: list[Bookmaker] = Field(default_factory=list)
 
+    @cached_property
+    def market_index(self) -> dict[str, list[tuple[Bookmaker, list[OutcomeOdds]]]]:
+        """Market key → [(book, outcomes)], built once and shared by every detector.
+
+        Only a book's first market with a given key counts, and books whose
+        market has no outcomes are left out. Call ``reset_market_index``
+        after changing ``bookmakers`` or their markets.
+        """
+        by_market: dict[str, list[tuple[Bookmaker, list[OutcomeOdds]]]] = {}
+        for bm in self.bookmakers:
+            seen: set[str] = set()
+            for m in bm.markets:
+                if m.key in seen:
+                    continue
+                seen.add(m.key)
+                if m.outcomes:
+                    by_market.setdefault(m.key, []).append((bm, m.outcomes))
+        return by_market
+
+    def reset_market_index(self) -> None:
+        self.__dict__.pop("market_index", None)
+
 
 class ScoreValue(BaseModel):
     name: str
@@ -62,19 +99,26 @@ class Score(BaseModel):
     last_update: datetime | None = None
     scores: list[ScoreValue] | None = None
 
+    @cached_property
+    def score_by_name(self) -> dict[str, str]:
+        """Team name → first non-null score, built once on first use.
+
+        Call ``reset_score_by_name`` after changing ``scores``.
+        """
+        by_name: dict[str, str] = {}
+        for s in self.scores or ():
+            if s.score is not None:
+                by_name.setdefault(s.name, s.score)
+        return by_name
+
+    def reset_score_by_name(self) -> None:
+        self.__dict__.pop("score_by_name", None)
+
     def home_score(self) -> str:
-        if self.scores:
-            for s in self.scores:
-                if s.name == self.home_team and s.score is not None:
-                    return s.score
-        return "-"
+        return self.score_by_name.get(self.home_team, "-")
 
     def away_score(self) -> str:
-        if self.scores:
-            for s in self.scores:
-                if s.name == self.away_team and s.score is not None:
-                    return s.score
-        return "-"
+        return self.score_by_name.get(self.away_team, "-")
 
 
 class GameRow(BaseModel):
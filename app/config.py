@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import functools
 import logging
 import os
 from pathlib import Path
@@ -14,10 +15,21 @@ log = logging.getLogger(__name__)
 
 PROJECT_ROOT = Path(__file__).resolve().parent.parent
 
+# libyaml-backed loader when PyYAML was built with it; same safe subset.
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+
+_env_loaded = False
+
 
 def _load_env() -> None:
+    """Load .env into os.environ once per process."""
+    global _env_loaded
+    if _env_loaded:
+        return
     env_path = PROJECT_ROOT / ".env"
     load_dotenv(env_path)
+    _env_loaded = True
 
 
 def _load_yaml() -> dict:
@@ -25,7 +37,7 @@ def _load_yaml() -> dict:
     if settings_path.exists():
         try:
             with open(settings_path) as f:
-                return yaml.safe_load(f) or {}
+                return yaml.load(f, Loader=_YAML_LOADER) or {}
         except yaml.YAMLError:
             log.warning("Failed to parse settings.yaml, using defaults")
             return {}
@@ -61,6 +73,7 @@ class Settings(BaseModel):
     props_enabled: bool = True
     props_refresh_interval: int = 300
     props_max_concurrent: int = 5
+    api_rpm: int = 60
     # DFS books: book_key → effective odds for your lineup type.
     # API always returns a fixed juice (e.g. -137) but actual odds depend on legs.
     alt_lines_enabled: bool = False
@@ -89,13 +102,32 @@ class Settings(BaseModel):
         ],
     })
 
-    @property
+    # Settings are loaded once and never mutated, so the joined forms are
+    # computed on first access and kept.
+    @functools.cached_property
     def regions_str(self) -> str:
         """Comma-separated regions for API calls."""
         return ",".join(self.regions)
 
+    @functools.cached_property
+    def bookmakers_str(self) -> str:
+        """Comma-separated bookmakers for API calls."""
+        return ",".join(self.bookmakers)
+
+    @functools.cached_property
+    def regions_display(self) -> str:
+        """Regions as shown in the settings panel."""
+        return ", ".join(self.regions)
+
+    @functools.cached_property
+    def bookmakers_bulleted(self) -> str:
+        """One bookmaker per line, as shown in the settings panel."""
+        return "\n".join(f"  - {b}" for b in self.bookmakers)
+
 
+@functools.cache
 def load_settings() -> Settings:
+    """Read .env + settings.yaml once per process."""
     _load_env()
     raw = _load_yaml()
     raw["api_key"] = os.getenv("ODDS_API_KEY", "")
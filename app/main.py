@@ -2,12 +2,27 @@
 
 from __future__ import annotations
 
+import asyncio
+import sys
+
+
+def _new_event_loop() -> asyncio.AbstractEventLoop | None:
+    """A uvloop event loop when it's installed, else None for asyncio's default."""
+    if sys.platform == "win32":
+        return None
+    try:
+        import uvloop
+    except ImportError:
+        return None
+    loop: asyncio.AbstractEventLoop = uvloop.new_event_loop()
+    return loop
+
 
 def main() -> None:
     from app.ui.app import OddsTickerApp
 
     app = OddsTickerApp()
-    app.run()
+    app.run(loop=_new_event_loop())
 
 
 if __name__ == "__main__":
@@ -4,13 +4,32 @@ from __future__ import annotations
 
 
 class BudgetTracker:
-    """Tracks API credit usage from response headers."""
+    """Tracks API credit usage from response headers.
+
+    The derived flags and texts only change when ``update()`` runs, so they
+    are recomputed there and read as plain attributes everywhere else.
+    """
+
+    __slots__ = (
+        "remaining",
+        "used",
+        "low_warning",
+        "critical_stop",
+        "is_low",
+        "is_critical",
+        "can_fetch_odds",
+        "can_fetch_scores",
+        "can_fetch_props",
+        "status_text",
+        "warning_text",
+    )
 
     def __init__(self, low_warning: int = 50, critical_stop: int = 10) -> None:
         self.remaining: int | None = None
         self.used: int | None = None
         self.low_warning = low_warning
         self.critical_stop = critical_stop
+        self._recompute()
 
     def update(self, remaining: int | None, used: int | None) -> None:
         if remaining is not None:
@@ -19,50 +38,32 @@ class BudgetTracker:
         if used is not None:
             if self.used is None or used >= self.used:
                 self.used = used
+        self._recompute()
 
-    @property
-    def is_low(self) -> bool:
-        if self.remaining is None:
-            return False
-        return self.remaining <= self.low_warning
-
-    @property
-    def is_critical(self) -> bool:
-        if self.remaining is None:
-            return False
-        return self.remaining <= self.critical_stop
-
-    @property
-    def can_fetch_odds(self) -> bool:
-        """Whether we have enough credits for an odds fetch. Blocks when low."""
-        if self.remaining is None:
-            return True  # Unknown budget, allow
-        return not self.is_low
-
-    @property
-    def can_fetch_scores(self) -> bool:
-        """Scores allowed when low, blocked only when critical."""
-        if self.remaining is None:
-            return True
-        return not self.is_critical
-
-    @property
-    def can_fetch_props(self) -> bool:
-        """Props require multiple per-event calls — use a higher threshold."""
-        if self.remaining is None:
-            return True
-        return self.remaining > self.critical_stop * 3
-
-    @property
-    def status_text(self) -> str:
-        if self.remaining is None:
-            return "Credits: --"
-        return f"Credits: {self.remaining}"
+    def _recompute(self) -> None:
+        remaining = self.remaining
+        if remaining is None:
+            # Unknown budget, allow everything
+            self.is_low = False
+            self.is_critical = False
+            self.can_fetch_odds = True
+            self.can_fetch_scores = True
+            self.can_fetch_props = True
+            self.status_text = "Credits: --"
+            self.warning_text = ""
+            return
 
-    @property
-    def warning_text(self) -> str:
+        self.is_low = remaining <= self.low_warning
+        self.is_critical = remaining <= self.critical_stop
+        # Odds blocked when low; scores only when critical
+        self.can_fetch_odds = not self.is_low
+        self.can_fetch_scores = not self.is_critical
+        # Props require multiple per-event calls — use a higher threshold
+        self.can_fetch_props = remaining > self.critical_stop * 3
+        self.status_text = f"Credits: {remaining}"
         if self.is_critical:
-            return "CREDITS CRITICAL - Pausing all API calls"
-        if self.is_low:
-            return "Credits low - Scores only mode"
-        return ""
+            self.warning_text = "CREDITS CRITICAL - Pausing all API calls"
+        elif self.is_low:
+            self.warning_text = "Credits low - Scores only mode"
+        else:
+            self.warning_text = ""
@@ -1,16 +1,101 @@
-"""In-memory TTL cache keyed by {sport}:{endpoint}."""
+"""In-memory TTL cache keyed by {sport}:{endpoint}, optionally backed by SQLite."""
 
 from __future__ import annotations
 
+import asyncio
+import functools
+import logging
+import pickle
+import sqlite3
 import time
-from typing import Any
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, TypeVar, cast
+
+log = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+CACHE_PATH = Path(__file__).resolve().parent.parent.parent / "odds_cache.db"
+
+# In-memory entry cap for the app cache; a handful of keys per sport.
+CACHE_MAX_ENTRIES = 128
 
 
 class TTLCache:
-    """Simple in-memory cache with per-key TTL."""
+    """Simple in-memory cache with per-key TTL.
+
+    Expired entries are dropped lazily on ``get`` and swept in bulk on
+    ``set`` once the earliest known expiry has passed, so keys that are
+    never read again don't pile up in a long-running session.
+
+    With ``persist_path``, still-valid entries are loaded from SQLite (WAL)
+    once when the cache is opened, so a restart reuses responses that
+    already cost credits. After that, ``set`` pickles a snapshot of the value
+    and every write is handed to a single background thread, so disk I/O
+    never runs on the event loop. Persisted expiry is wall-clock time since
+    monotonic time doesn't survive a restart.
+
+    With ``max_entries``, the least recently used entry is evicted from
+    memory once the cap is exceeded.
+    """
 
-    def __init__(self) -> None:
-        self._store: dict[str, tuple[Any, float]] = {}
+    __slots__ = ("_store", "_next_expiry", "_inflight", "_conn", "_writer", "_max_entries")
+
+    def __init__(
+        self,
+        persist_path: Path | str | None = None,
+        max_entries: int | None = None,
+    ) -> None:
+        self._store: OrderedDict[str, tuple[Any, float]] = OrderedDict()
+        self._max_entries = max_entries
+        self._next_expiry = float("inf")
+        self._inflight: dict[str, asyncio.Task[Any]] = {}
+        self._conn: sqlite3.Connection | None = None
+        self._writer: ThreadPoolExecutor | None = None
+        if persist_path is not None:
+            self._open(persist_path)
+
+    def _open(self, path: Path | str) -> None:
+        try:
+            conn = sqlite3.connect(str(path), check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            with conn:
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS cache "
+                    "(key TEXT PRIMARY KEY, value BLOB NOT NULL, expires_at REAL NOT NULL)"
+                )
+                conn.execute("DELETE FROM cache WHERE expires_at <= ?", (time.time(),))
+            rows = conn.execute("SELECT key, value, expires_at FROM cache").fetchall()
+        except sqlite3.Error:
+            log.warning("Failed to open cache database %s, caching in memory only", path)
+            return
+        self._conn = conn
+        # One worker keeps writes in call order (a set before its invalidate)
+        self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="ttlcache")
+        self._load_all(rows)
+
+    def close(self) -> None:
+        """Flush pending writes and close the database."""
+        if self._writer is not None:
+            self._writer.shutdown(wait=True)
+            self._writer = None
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def __len__(self) -> int:
+        self._sweep(time.monotonic())
+        return len(self._store)
+
+    def __contains__(self, key: object) -> bool:
+        if not isinstance(key, str):
+            return False
+        entry = self._store.get(key)
+        return entry is not None and time.monotonic() <= entry[1]
 
     def get(self, key: str) -> Any | None:
         entry = self._store.get(key)
@@ -20,13 +105,151 @@ class TTLCache:
         if time.monotonic() > expires_at:
             del self._store[key]
             return None
+        self._store.move_to_end(key)
         return value
 
     def set(self, key: str, value: Any, ttl: int) -> None:
-        self._store[key] = (value, time.monotonic() + ttl)
+        now = time.monotonic()
+        self._sweep(now)
+        expires_at = now + ttl
+        self._put(key, value, expires_at)
+        self._save(key, value, time.time() + ttl)
+
+    def replace(self, key: str, old: Any, new: Any) -> bool:
+        """Swap ``key``'s value for ``new`` if it is still ``old``, keeping its expiry.
+
+        Returns False (and changes nothing) if the entry expired or was
+        refreshed in the meantime.
+        """
+        entry = self._store.get(key)
+        if entry is None or entry[0] is not old:
+            return False
+        expires_at = entry[1]
+        remaining = expires_at - time.monotonic()
+        if remaining < 0:
+            return False
+        self._put(key, new, expires_at)
+        self._save(key, new, time.time() + remaining)
+        return True
+
+    def _put(self, key: str, value: Any, expires_at: float) -> None:
+        store = self._store
+        store[key] = (value, expires_at)
+        store.move_to_end(key)
+        if expires_at < self._next_expiry:
+            self._next_expiry = expires_at
+        if self._max_entries is not None:
+            while len(store) > self._max_entries:
+                store.popitem(last=False)
+
+    async def get_or_fetch(
+        self, key: str, fetch: Callable[[], Awaitable[T]], ttl: int,
+    ) -> T:
+        """Return the cached value, or run ``fetch`` once and cache its result.
+
+        Concurrent misses on the same key share a single in-flight fetch.
+        A ``None`` result is returned but not cached; exceptions propagate
+        to every waiter. If ``invalidate`` cancels the fetch mid-flight,
+        waiters start over with a fresh one instead of seeing the stale
+        result.
+        """
+        while True:
+            value = self.get(key)
+            if value is not None:
+                return cast(T, value)
+            task = self._inflight.get(key)
+            if task is None:
+                task = asyncio.ensure_future(self._fill(key, fetch, ttl))
+                self._inflight[key] = task
+                task.add_done_callback(functools.partial(self._forget, key))
+            try:
+                # Shielded so one caller being cancelled doesn't cancel the others
+                return cast(T, await asyncio.shield(task))
+            except asyncio.CancelledError:
+                current = asyncio.current_task()
+                if task.cancelled() and (current is None or not current.cancelling()):
+                    continue
+                raise
+
+    async def _fill(self, key: str, fetch: Callable[[], Awaitable[T]], ttl: int) -> T:
+        value = await fetch()
+        if value is not None:
+            self.set(key, value, ttl)
+        return value
+
+    def _forget(self, key: str, task: asyncio.Task[Any]) -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
 
     def invalidate(self, key: str) -> None:
+        """Drop ``key`` and cancel any fetch still in flight for it."""
         self._store.pop(key, None)
+        task = self._inflight.pop(key, None)
+        if task is not None:
+            task.cancel()
+        if self._writer is not None:
+            self._writer.submit(self._write, "DELETE FROM cache WHERE key = ?", (key,))
 
     def clear(self) -> None:
         self._store.clear()
+        self._next_expiry = float("inf")
+        if self._writer is not None:
+            self._writer.submit(self._write, "DELETE FROM cache", ())
+
+    def _load_all(self, rows: list[tuple[str, bytes, float]]) -> None:
+        """Pull every still-valid persisted entry into memory."""
+        now_wall, now = time.time(), time.monotonic()
+        for key, blob, expires_at in rows:
+            try:
+                value = pickle.loads(blob)
+            except Exception:
+                log.warning("Discarding unreadable cache entry %s", key)
+                continue
+            self._put(key, value, now + (expires_at - now_wall))
+
+    def _save(self, key: str, value: Any, expires_at: float) -> None:
+        """Snapshot ``value`` now, on the caller's thread, and queue the write.
+
+        Pickling here rather than on the writer thread means later in-place
+        changes to the cached object can't leak into (or break) the saved copy.
+        """
+        writer = self._writer
+        if writer is None:
+            return
+        try:
+            blob = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        except Exception:
+            log.warning("Not persisting unpicklable cache value for %s", key, exc_info=True)
+            return
+        writer.submit(
+            self._write,
+            "INSERT INTO cache (key, value, expires_at) VALUES (?, ?, ?) "
+            "ON CONFLICT(key) DO UPDATE SET "
+            "value = excluded.value, expires_at = excluded.expires_at",
+            (key, blob, expires_at),
+        )
+
+    # ── Writer thread ──
+
+    def _write(self, sql: str, params: tuple[Any, ...]) -> None:
+        conn = self._conn
+        if conn is None:
+            return
+        try:
+            with conn:
+                conn.execute(sql, params)
+        except sqlite3.Error:
+            log.warning("Failed to write cache database", exc_info=True)
+
+    def _sweep(self, now: float) -> None:
+        """Drop every expired entry, but only once something can have expired."""
+        if now <= self._next_expiry:
+            return
+        store = self._store
+        next_expiry = float("inf")
+        for key, (_, expires_at) in list(store.items()):
+            if now > expires_at:
+                del store[key]
+            elif expires_at < next_expiry:
+                next_expiry = expires_at
+        self._next_expiry = next_expiry
@@ -4,6 +4,7 @@ from __future__ import annotations
 
 import asyncio
 import logging
+from itertools import groupby
 
 from app.api.client import OddsAPIClient
 from app.api.endpoints import (
@@ -14,10 +15,10 @@ from app.api.endpoints import (
     get_scores,
     get_sports,
 )
-from app.api.models import Bookmaker, Event, GameRow, PropRow, Score, Sport
+from app.api.models import Bookmaker, Event, GameRow, Market, PropRow, Score, Sport
 from app.config import Settings
 from app.services.budget import BudgetTracker
-from app.services.cache import TTLCache
+from app.services.cache import CACHE_MAX_ENTRIES, CACHE_PATH, TTLCache
 from app.services.ev import (
     ArbBet,
     EVBet,
@@ -34,6 +35,15 @@ log = logging.getLogger(__name__)
 
 ALT_MARKETS = "alternate_spreads,alternate_totals"
 
+# The arb/middle panels render every row they're given; a prop slate can
+# produce thousands of middles, so only the best are handed over.
+MAX_PANEL_ROWS = 100
+
+# The sports list changes on an hour scale. Past the hour the last known list
+# is still served (and refreshed behind it) for up to a week.
+SPORTS_TTL = 3600
+SPORTS_STALE_TTL = 7 * 24 * 3600
+
 
 class DataService:
     """Orchestrates API fetches, caching, merging, and EV detection."""
@@ -47,32 +57,60 @@ class DataService:
         ev_store: EVStore | None = None,
     ) -> None:
         self.settings = settings
-        self.client = client or OddsAPIClient(settings.api_key)
-        self.cache = cache or TTLCache()
+        self.client = client or OddsAPIClient(settings.api_key, rpm=settings.api_rpm)
+        # TTLCache defines __len__, so an empty injected cache is falsy
+        self.cache = cache if cache is not None else TTLCache(
+            persist_path=CACHE_PATH, max_entries=CACHE_MAX_ENTRIES,
+        )
         self.budget = budget or BudgetTracker(
             low_warning=settings.low_credit_warning,
             critical_stop=settings.critical_credit_stop,
         )
         self.ev_store = ev_store or EVStore()
         self._sports_cache: list[Sport] = []
+        self._sports_refresh: asyncio.Task[list[Sport]] | None = None
+        # (sport, event_id) -> pending alt-line fetch, shared by concurrent callers
+        self._alt_inflight: dict[tuple[str, str], asyncio.Future[list | None]] = {}
+        # Shared across sports so concurrent refreshes can't multiply the cap
+        self._alt_sem = asyncio.Semaphore(settings.props_max_concurrent)
 
     async def close(self) -> None:
+        if self._sports_refresh is not None:
+            self._sports_refresh.cancel()
         await self.client.close()
         self.ev_store.close()
+        self.cache.close()
 
     def _sync_budget(self) -> None:
         info = self.client.last_credit_info
         self.budget.update(info.remaining, info.used)
 
     async def fetch_sports(self) -> list[Sport]:
-        """Fetch available sports (free endpoint)."""
-        cached = self.cache.get("sports")
-        if cached is not None:
-            return cached
-        try:
+        """Fetch available sports (free endpoint).
+
+        Stale-while-revalidate: once the hourly entry has expired, the last
+        known list (persisted with the cache) is returned immediately and
+        refreshed in the background, so startup doesn't wait on the request.
+        """
+        sports: list[Sport] | None = self.cache.get("sports")
+        if sports is None:
+            sports = self.cache.get("sports:stale")
+            if sports is None:
+                return await self._refresh_sports()
+            if self._sports_refresh is None or self._sports_refresh.done():
+                self._sports_refresh = asyncio.create_task(self._refresh_sports())
+        self._sports_cache = sports
+        return sports
+
+    async def _refresh_sports(self) -> list[Sport]:
+        async def _fetch() -> list[Sport]:
             sports = await get_sports(self.client)
+            self.cache.set("sports:stale", sports, ttl=SPORTS_STALE_TTL)
+            return sports
+
+        try:
+            sports = await self.cache.get_or_fetch("sports", _fetch, ttl=SPORTS_TTL)
             self._sports_cache = sports
-            self.cache.set("sports", sports, ttl=3600)
             return sports
         except Exception:
             log.exception("Failed to fetch sports")
@@ -81,7 +119,7 @@ class DataService:
     async def has_events(self, sport: str) -> bool:
         """Check if a sport has any events (free endpoint)."""
         cache_key = f"{sport}:events_check"
-        cached = self.cache.get(cache_key)
+        cached: bool | None = self.cache.get(cache_key)
         if cached is not None:
             return cached
         try:
@@ -98,16 +136,15 @@ class DataService:
             log.warning("Budget critical, skipping scores fetch")
             return self.cache.get(f"{sport}:scores") or []
 
-        cache_key = f"{sport}:scores"
-        cached = self.cache.get(cache_key)
-        if cached is not None:
-            return cached
-
-        try:
+        async def _fetch() -> list[Score]:
             scores = await get_scores(self.client, sport)
             self._sync_budget()
-            self.cache.set(cache_key, scores, ttl=self.settings.scores_refresh_interval)
             return scores
+
+        try:
+            return await self.cache.get_or_fetch(
+                f"{sport}:scores", _fetch, ttl=self.settings.scores_refresh_interval,
+            )
         except Exception:
             log.exception("Failed to fetch scores for %s", sport)
             return []
@@ -121,23 +158,22 @@ class DataService:
             log.warning("Budget low, skipping odds fetch")
             return self.cache.get(f"{sport}:odds") or []
 
-        cache_key = f"{sport}:odds"
-        cached = self.cache.get(cache_key)
-        if cached is not None:
-            return cached
-
-        try:
+        async def _fetch() -> list[Event]:
             events = await get_odds(
                 self.client,
                 sport,
                 regions=self.settings.regions_str,
                 markets="h2h,spreads,totals",
                 odds_format=self.settings.odds_format,
-                bookmakers=self.settings.bookmakers,
+                bookmakers=self.settings.bookmakers_str,
             )
             self._sync_budget()
-            self.cache.set(cache_key, events, ttl=self.settings.odds_refresh_interval)
             return events
+
+        try:
+            return await self.cache.get_or_fetch(
+                f"{sport}:odds", _fetch, ttl=self.settings.odds_refresh_interval,
+            )
         except Exception:
             log.exception("Failed to fetch odds for %s", sport)
             return []
@@ -148,7 +184,8 @@ class DataService:
         Alt markets (alternate_spreads, alternate_totals) are non-featured
         and must be queried one event at a time via /events/{id}/odds.
         Each call costs credits, so this is gated by alt_lines_enabled.
-        Returns the same events list with alt markets appended to bookmakers.
+        Returns the events with alt markets appended to their bookmakers;
+        the cached odds entry is swapped for the merged list.
         """
         if not self.settings.alt_lines_enabled or not events:
             return events
@@ -157,68 +194,115 @@ class DataService:
         cached = self.cache.get(cache_key)
         if cached is not None:
             # cached is a dict of event_id → list of (book_key, markets)
-            self._merge_alt_data(events, cached)
-            return events
+            return self._swap_merged(sport, events, cached)
 
         if not self.budget.can_fetch_odds:
             return events
 
-        sem = asyncio.Semaphore(self.settings.props_max_concurrent)
-        alt_data: dict[str, list[tuple[str, str, list]]] = {}
+        alt_data: dict[str, list[tuple[str, str, list[Market]]]] = {}
 
         async def _fetch_one(event_id: str) -> None:
-            async with sem:
+            key = (sport, event_id)
+            pending = self._alt_inflight.get(key)
+            if pending is not None:
+                # Another caller is already fetching this event — reuse it
+                entries = await asyncio.shield(pending)
+            else:
+                fut: asyncio.Future[list | None] = asyncio.get_running_loop().create_future()
+                self._alt_inflight[key] = fut
+                entries = None
                 try:
-                    alt_event = await get_event_odds(
-                        self.client,
-                        sport,
-                        event_id,
-                        regions=self.settings.regions_str,
-                        markets=ALT_MARKETS,
-                        odds_format=self.settings.odds_format,
-                        bookmakers=self.settings.bookmakers,
-                    )
+                    async with self._alt_sem:
+                        alt_event = await get_event_odds(
+                            self.client,
+                            sport,
+                            event_id,
+                            regions=self.settings.regions_str,
+                            markets=ALT_MARKETS,
+                            odds_format=self.settings.odds_format,
+                            bookmakers=self.settings.bookmakers_str,
+                        )
                     self._sync_budget()
                     # Store bookmaker data for merging
-                    alt_data[event_id] = [
-                        (bm.key, bm.title, [m.model_dump() for m in bm.markets])
+                    entries = [
+                        (bm.key, bm.title, bm.markets)
                         for bm in alt_event.bookmakers
                         if bm.markets
                     ]
                 except Exception:
                     log.warning("Failed to fetch alt lines for event %s", event_id)
+                finally:
+                    del self._alt_inflight[key]
+                    fut.set_result(entries)
+            if entries is not None:
+                alt_data[event_id] = entries
 
-        event_ids = [e.id for e in events]
-        await asyncio.gather(*[_fetch_one(eid) for eid in event_ids])
+        async with asyncio.TaskGroup() as tg:
+            for event in events:
+                tg.create_task(_fetch_one(event.id))
 
-        if alt_data:
-            self.cache.set(cache_key, alt_data, ttl=self.settings.odds_refresh_interval)
-            self._merge_alt_data(events, alt_data)
+        if not alt_data:
+            return events
+        self.cache.set(cache_key, alt_data, ttl=self.settings.odds_refresh_interval)
+        return self._swap_merged(sport, events, alt_data)
 
-        return events
+    def _swap_merged(
+        self,
+        sport: str,
+        events: list[Event],
+        alt_data: dict[str, list[tuple[str, str, list[Market]]]],
+    ) -> list[Event]:
+        """Merge alt lines and swap the result into the odds cache in one step."""
+        merged = self._merge_alt_data(events, alt_data)
+        if merged is not events:
+            self.cache.replace(f"{sport}:odds", events, merged)
+        return merged
 
     @staticmethod
     def _merge_alt_data(
         events: list[Event],
-        alt_data: dict[str, list[tuple[str, str, list]]],
-    ) -> None:
-        """Merge cached alt-line market data into existing events."""
-        from app.api.models import Market
-
-        event_map = {e.id: e for e in events}
-        for event_id, book_entries in alt_data.items():
-            event = event_map.get(event_id)
-            if not event:
+        alt_data: dict[str, list[tuple[str, str, list[Market]]]],
+    ) -> list[Event]:
+        """Return ``events`` with alt-line markets merged in.
+
+        Never mutates: an event that gains markets is replaced by a copy with
+        its own bookmaker and market lists, since detector scans may be
+        walking the originals on a worker thread. Idempotent: a book never
+        gets a market key it already has, and if nothing is added the same
+        list comes back.
+        """
+        merged = list(events)
+        changed = False
+        for i, event in enumerate(events):
+            book_entries = alt_data.get(event.id)
+            if not book_entries:
                 continue
-            base_books = {bm.key: bm for bm in event.bookmakers}
-            for book_key, book_title, raw_markets in book_entries:
-                markets = [Market(**m) for m in raw_markets]
-                if book_key in base_books:
-                    base_books[book_key].markets.extend(markets)
-                else:
-                    event.bookmakers.append(
-                        Bookmaker(key=book_key, title=book_title, markets=markets)
+            books = list(event.bookmakers)
+            slot = {bm.key: j for j, bm in enumerate(books)}
+            added = False
+            for book_key, book_title, markets in book_entries:
+                j = slot.get(book_key)
+                if j is None:
+                    slot[book_key] = len(books)
+                    books.append(
+                        Bookmaker.model_construct(
+                            key=book_key, title=book_title, markets=list(markets),
+                        )
                     )
+                    added = True
+                    continue
+                bm = books[j]
+                have = {m.key for m in bm.markets}
+                extra = [m for m in markets if m.key not in have]
+                if extra:
+                    books[j] = bm.model_copy(update={"markets": [*bm.markets, *extra]})
+                    added = True
+            if added:
+                copy = event.model_copy(update={"bookmakers": books})
+                copy.reset_market_index()  # model_copy carries the cached index over
+                merged[i] = copy
+                changed = True
+        return merged if changed else events
 
     async def get_game_rows(self, sport: str) -> list[GameRow]:
         """Merge scores + odds into unified game rows."""
@@ -228,44 +312,39 @@ class DataService:
 
         # Enrich with alt lines before building rows
         if self.settings.alt_lines_enabled:
-            await self.fetch_alt_lines(sport, events)
+            events = await self.fetch_alt_lines(sport, events)
 
-        score_map: dict[str, Score] = {s.id: s for s in scores}
-        rows: list[GameRow] = []
-
-        seen_ids: set[str] = set()
+        rows_by_id: dict[str, GameRow] = {}
         for event in events:
-            score = score_map.get(event.id)
-            rows.append(
-                GameRow(
-                    event_id=event.id,
-                    sport_key=event.sport_key,
-                    home_team=event.home_team,
-                    away_team=event.away_team,
-                    commence_time=event.commence_time,
-                    home_score=score.home_score() if score else "-",
-                    away_score=score.away_score() if score else "-",
-                    completed=score.completed if score else False,
-                    bookmakers=event.bookmakers,
-                )
+            rows_by_id[event.id] = GameRow(
+                event_id=event.id,
+                sport_key=event.sport_key,
+                home_team=event.home_team,
+                away_team=event.away_team,
+                commence_time=event.commence_time,
+                bookmakers=event.bookmakers,
             )
-            seen_ids.add(event.id)
 
         for score in scores:
-            if score.id not in seen_ids:
-                rows.append(
-                    GameRow(
-                        event_id=score.id,
-                        sport_key=score.sport_key,
-                        home_team=score.home_team,
-                        away_team=score.away_team,
-                        commence_time=score.commence_time,
-                        home_score=score.home_score(),
-                        away_score=score.away_score(),
-                        completed=score.completed,
-                    )
+            row = rows_by_id.get(score.id)
+            if row is None:
+                # Score with no odds still gets a row
+                rows_by_id[score.id] = GameRow(
+                    event_id=score.id,
+                    sport_key=score.sport_key,
+                    home_team=score.home_team,
+                    away_team=score.away_team,
+                    commence_time=score.commence_time,
+                    home_score=score.home_score(),
+                    away_score=score.away_score(),
+                    completed=score.completed,
                 )
+            else:
+                row.home_score = score.home_score()
+                row.away_score = score.away_score()
+                row.completed = score.completed
 
+        rows = list(rows_by_id.values())
         rows.sort(key=lambda r: (r.completed, r.commence_time))
         return rows
 
@@ -284,11 +363,14 @@ class DataService:
 
     async def get_ev_bets(self, sport: str) -> list[EVBet]:
         """Find +EV bets for pre-game events only and persist to store."""
-        events = await self.fetch_odds(sport)
-        scores = await self.fetch_scores(sport)
+        events, scores = await asyncio.gather(
+            self.fetch_odds(sport), self.fetch_scores(sport),
+        )
         pre_game = self._filter_pre_game(events, scores)
 
-        bets = find_ev_bets(
+        # CPU-bound scan; run it off the event loop so the UI stays responsive
+        bets = await asyncio.to_thread(
+            find_ev_bets,
             pre_game,
             selected_books=self.settings.bookmakers,
             ev_threshold=self.settings.ev_threshold,
@@ -297,9 +379,7 @@ class DataService:
         )
 
         # Persist to SQLite and deactivate bets that disappeared
-        if bets:
-            await asyncio.to_thread(self.ev_store.upsert_bets, bets)
-        await asyncio.to_thread(self.ev_store.deactivate_missing, sport, bets, is_props=False)
+        await asyncio.to_thread(self.ev_store.sync_sport, sport, bets, is_props=False)
 
         return bets
 
@@ -313,27 +393,33 @@ class DataService:
         """Find arbitrage opportunities for pre-game events."""
         if not self.settings.arb_enabled:
             return []
-        events = await self.fetch_odds(sport)
-        scores = await self.fetch_scores(sport)
+        events, scores = await asyncio.gather(
+            self.fetch_odds(sport), self.fetch_scores(sport),
+        )
         pre_game = self._filter_pre_game(events, scores)
-        return find_arb_bets(
+        return await asyncio.to_thread(
+            find_arb_bets,
             pre_game,
             min_profit_pct=self.settings.arb_min_profit_pct,
             dfs_books=self.settings.dfs_books,
+            top_n=MAX_PANEL_ROWS,
         )
 
     async def get_middle_bets(self, sport: str) -> list[MiddleBet]:
         """Find middle opportunities for pre-game events."""
         if not self.settings.middle_enabled:
             return []
-        events = await self.fetch_odds(sport)
-        scores = await self.fetch_scores(sport)
+        events, scores = await asyncio.gather(
+            self.fetch_odds(sport), self.fetch_scores(sport),
+        )
         pre_game = self._filter_pre_game(events, scores)
-        return find_middle_bets(
+        return await asyncio.to_thread(
+            find_middle_bets,
             pre_game,
             min_window=self.settings.middle_min_window,
             max_combined_cost=self.settings.middle_max_combined_cost,
             dfs_books=self.settings.dfs_books,
+            top_n=MAX_PANEL_ROWS,
         )
 
     # ── Props ──
@@ -344,22 +430,16 @@ class DataService:
             log.warning("Budget too low for props fetch")
             return self.cache.get(f"{sport}:props") or []
 
-        cache_key = f"{sport}:props"
-        cached = self.cache.get(cache_key)
-        if cached is not None:
-            return cached
-
         # Get the prop market keys for this sport
         markets = self.settings.props_markets.get(sport, [])
         if not markets:
             return []
 
-        try:
+        async def _fetch() -> list[Event] | None:
             # Get event IDs (free endpoint)
-            raw_events = await get_events(self.client, sport)
-            event_ids = [e["id"] for e in raw_events]
+            event_ids = [e.id for e in await get_events(self.client, sport)]
             if not event_ids:
-                return []
+                return None  # nothing scheduled yet; don't cache the miss
 
             events = await get_props_for_events(
                 self.client,
@@ -368,14 +448,17 @@ class DataService:
                 regions=self.settings.regions_str,
                 markets=",".join(markets),
                 odds_format=self.settings.odds_format,
-                bookmakers=self.settings.bookmakers,
+                bookmakers=self.settings.bookmakers_str,
                 max_concurrent=self.settings.props_max_concurrent,
             )
             self._sync_budget()
-            self.cache.set(
-                cache_key, events, ttl=self.settings.props_refresh_interval
-            )
             return events
+
+        try:
+            events = await self.cache.get_or_fetch(
+                f"{sport}:props", _fetch, ttl=self.settings.props_refresh_interval,
+            )
+            return events or []
         except Exception:
             log.exception("Failed to fetch props for %s", sport)
             return []
@@ -387,19 +470,24 @@ class DataService:
         become separate rows.  DFS book odds are overridden from settings.
         """
         dfs = self.settings.dfs_books
-        merged: dict[str, PropRow] = {}
+        # event_id -> (event, {(player, market, point): row})
+        per_event: dict[str, tuple[Event, dict[tuple[str, str, float | None], PropRow]]] = {}
 
         for event in events:
+            entry = per_event.get(event.id)
+            if entry is None:
+                entry = per_event[event.id] = (event, {})
+            merged = entry[1]
             for bm in event.bookmakers:
                 for mkt in bm.markets:
                     for outcome in mkt.outcomes:
                         if not outcome.description:
                             continue
                         pt = outcome.point
-                        pt_key = str(pt) if pt is not None else "_"
-                        key = f"{event.id}|{outcome.description}|{mkt.key}|{pt_key}"
-                        if key not in merged:
-                            merged[key] = PropRow(
+                        key = (outcome.description, mkt.key, pt)
+                        row = merged.get(key)
+                        if row is None:
+                            row = merged[key] = PropRow(
                                 event_id=event.id,
                                 sport_key=event.sport_key,
                                 home_team=event.home_team,
@@ -410,24 +498,29 @@ class DataService:
                                 consensus_point=pt,
                             )
 
-                        row = merged[key]
                         price = dfs.get(bm.key, outcome.price)
                         if outcome.name == "Over":
                             row.over_odds[bm.key] = price
                         elif outcome.name == "Under":
                             row.under_odds[bm.key] = price
 
-        result = list(merged.values())
-        result.sort(key=lambda r: (
-            r.commence_time, r.home_team, r.player_name,
-            r.market_key, r.consensus_point or 0,
-        ))
+        # Order by (commence_time, home_team, player, market, point): sort the
+        # few events by the lead key, then only each event's own rows.
+        def _lead(entry: tuple[Event, dict]) -> tuple:
+            return entry[0].commence_time, entry[0].home_team
+
+        result: list[PropRow] = []
+        for _, group in groupby(sorted(per_event.values(), key=_lead), key=_lead):
+            rows = [row for _, merged in group for row in merged.values()]
+            rows.sort(key=lambda r: (r.player_name, r.market_key, r.consensus_point or 0))
+            result.extend(rows)
         return result
 
     async def get_prop_ev_bets(self, sport: str) -> list[EVBet]:
         """Find +EV prop bets and persist to store."""
         events = await self.fetch_props(sport)
-        bets = find_ev_bets(
+        bets = await asyncio.to_thread(
+            find_ev_bets,
             events,
             selected_books=self.settings.bookmakers,
             ev_threshold=self.settings.ev_threshold,
@@ -435,9 +528,7 @@ class DataService:
             dfs_books=self.settings.dfs_books,
             odds_range=(self.settings.ev_odds_min, self.settings.ev_odds_max),
         )
-        if bets:
-            await asyncio.to_thread(self.ev_store.upsert_bets, bets)
-        await asyncio.to_thread(self.ev_store.deactivate_missing, sport, bets, is_props=True)
+        await asyncio.to_thread(self.ev_store.sync_sport, sport, bets, is_props=True)
         return bets
 
     def get_prop_ev_for_sport(self, sport: str) -> list[dict]:
@@ -449,10 +540,12 @@ class DataService:
         if not self.settings.arb_enabled:
             return []
         events = self.cache.get(f"{sport}:props") or []
-        return find_prop_arb_bets(
+        return await asyncio.to_thread(
+            find_prop_arb_bets,
             events,
             min_profit_pct=self.settings.arb_min_profit_pct,
             dfs_books=self.settings.dfs_books,
+            top_n=MAX_PANEL_ROWS,
         )
 
     async def get_prop_middle_bets(self, sport: str) -> list[MiddleBet]:
@@ -460,15 +553,17 @@ class DataService:
         if not self.settings.middle_enabled:
             return []
         events = self.cache.get(f"{sport}:props") or []
-        return find_prop_middle_bets(
+        return await asyncio.to_thread(
+            find_prop_middle_bets,
             events,
             min_window=self.settings.middle_min_window,
             max_combined_cost=self.settings.middle_max_combined_cost,
             dfs_books=self.settings.dfs_books,
+            top_n=MAX_PANEL_ROWS,
         )
 
     def force_refresh(self, sport: str) -> None:
-        """Invalidate cache for a sport to force a fresh fetch."""
+        """Invalidate cache for a sport, cancelling in-flight fetches, to force a fresh fetch."""
         self.cache.invalidate(f"{sport}:scores")
         self.cache.invalidate(f"{sport}:odds")
         self.cache.invalidate(f"{sport}:odds:alt")
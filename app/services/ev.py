@@ -2,13 +2,28 @@
 
 from __future__ import annotations
 
+import functools
+import heapq
 import math
+from bisect import bisect_left
+from collections import defaultdict
+from collections.abc import Callable, Hashable, Mapping
 from datetime import datetime
+from itertools import combinations
+from operator import itemgetter
+from typing import TypeVar
 
 from pydantic import BaseModel
 
 from app.api.models import Bookmaker, Event, OutcomeOdds
 
+# Outcome grouping key, e.g. (name, point) for game markets
+K = TypeVar("K", bound=Hashable)
+T = TypeVar("T")
+
+# Books needed on every outcome before a no-vig consensus is trusted
+MIN_CONSENSUS_BOOKS = 3
+
 
 class EVBet(BaseModel):
     """A detected +EV betting opportunity."""
@@ -87,6 +102,8 @@ class MiddleBet(BaseModel):
     is_prop: bool = False
 
 
+# Books quote from a small set of prices, so repeat conversions are cache hits
+@functools.lru_cache(maxsize=4096)
 def american_to_decimal(american: float) -> float:
     """Convert American odds to decimal odds."""
     if american == 0:
@@ -99,12 +116,21 @@ def american_to_decimal(american: float) -> float:
 
 def american_to_implied_prob(american: float) -> float:
     """Convert American odds to implied probability."""
-    if american == 0:
-        return 0.0
+    prob = _IMPLIED_BY_PRICE.get(american)
+    if prob is not None:
+        return prob
+    return _implied_prob(american)
+
+
+def _implied_prob(american: float) -> float:
     if american < 0:
-        return abs(american) / (abs(american) + 100)
-    else:
-        return 100 / (american + 100)
+        return -american / (100 - american)
+    return 100 / (american + 100) if american else 0.0
+
+
+# Books quote whole-number odds, so the common range is precomputed; a float
+# price like -110.0 hashes equal to the int key. Anything else falls through.
+_IMPLIED_BY_PRICE: dict[float, float] = {a: _implied_prob(a) for a in range(-2000, 2001)}
 
 
 def prob_to_american(prob: float) -> float:
@@ -125,15 +151,6 @@ def remove_vig(probs: list[float]) -> list[float]:
     return [p / total for p in probs]
 
 
-def _get_market_outcomes(
-    bookmaker: Bookmaker, market_key: str
-) -> list[OutcomeOdds] | None:
-    for m in bookmaker.markets:
-        if m.key == market_key:
-            return m.outcomes
-    return None
-
-
 def compute_inline_ev(
     prices: list[float], counter_prices: list[float],
 ) -> tuple[float | None, float | None]:
@@ -145,11 +162,40 @@ def compute_inline_ev(
     """
     if len(prices) < 3 or len(counter_prices) < 3:
         return None, None
+    avg_prob, best = _avg_implied_and_best(prices)
+    avg_counter = sum(map(american_to_implied_prob, counter_prices)) / len(counter_prices)
+    return _inline_ev_side(avg_prob, avg_counter, best)
+
 
-    # Average implied prob for each side
-    avg_prob = sum(american_to_implied_prob(p) for p in prices) / len(prices)
-    avg_counter = sum(american_to_implied_prob(p) for p in counter_prices) / len(counter_prices)
+def compute_inline_ev_pair(
+    prices_a: list[float], prices_b: list[float],
+) -> tuple[float | None, float | None, float | None, float | None]:
+    """``compute_inline_ev`` for both sides of a two-way market at once.
 
+    Returns (a_no_vig, a_ev, b_no_vig, b_ev); each side's prices are only
+    averaged once instead of once per direction.
+    """
+    if len(prices_a) < 3 or len(prices_b) < 3:
+        return None, None, None, None
+    avg_a, best_a = _avg_implied_and_best(prices_a)
+    avg_b, best_b = _avg_implied_and_best(prices_b)
+    return (*_inline_ev_side(avg_a, avg_b, best_a), *_inline_ev_side(avg_b, avg_a, best_b))
+
+
+def _avg_implied_and_best(prices: list[float]) -> tuple[float, float]:
+    """Average implied prob of ``prices``, tracking the best price on the way."""
+    prob_sum = 0.0
+    best = prices[0]
+    for p in prices:
+        prob_sum += american_to_implied_prob(p)
+        if p > best:
+            best = p
+    return prob_sum / len(prices), best
+
+
+def _inline_ev_side(
+    avg_prob: float, avg_counter: float, best: float,
+) -> tuple[float | None, float | None]:
     # Normalize to remove vig
     total = avg_prob + avg_counter
     if total <= 0:
@@ -162,22 +208,12 @@ def compute_inline_ev(
     fair_american = prob_to_american(no_vig_prob)
 
     # EV% of the best available price
-    best = max(prices)
     best_decimal = american_to_decimal(best)
     ev_pct = (no_vig_prob * best_decimal - 1) * 100
 
     return fair_american, ev_pct
 
 
-def _effective_price(
-    outcome: OutcomeOdds, bm: Bookmaker, dfs_books: dict[str, float] | None,
-) -> float:
-    """Return configured DFS odds or actual book price."""
-    if dfs_books and bm.key in dfs_books:
-        return dfs_books[bm.key]
-    return outcome.price
-
-
 def find_ev_bets(
     events: list[Event],
     selected_books: list[str] | None = None,
@@ -185,6 +221,7 @@ def find_ev_bets(
     is_props: bool = False,
     dfs_books: dict[str, float] | None = None,
     odds_range: tuple[float, float] | None = None,
+    top_n: int | None = None,
 ) -> list[EVBet]:
     """Find +EV bets across all events and markets.
 
@@ -193,66 +230,65 @@ def find_ev_bets(
 
     When is_props=True, processes each (player, point) pair independently
     so normalization is correct (Over + Under at a specific line sum to 1).
+
+    With top_n, only the best top_n bets are returned.
     """
     ev_bets: list[EVBet] = []
     now = datetime.now()
+    # Membership is tested once per book per outcome, so hash it up front
+    selected = frozenset(selected_books) if selected_books else None
 
     for event in events:
         if is_props:
             _find_prop_ev(
-                event, ev_bets, now, selected_books, ev_threshold, dfs_books,
+                event, ev_bets, now, selected, ev_threshold, dfs_books,
                 odds_range,
             )
         else:
             _find_game_ev(
-                event, ev_bets, now, selected_books, ev_threshold, dfs_books,
+                event, ev_bets, now, selected, ev_threshold, dfs_books,
                 odds_range,
             )
 
-    ev_bets.sort(key=lambda b: b.ev_percentage, reverse=True)
-    return ev_bets
+    return _rank(ev_bets, lambda b: b.ev_percentage, top_n)
 
 
-def _discover_market_keys(event: Event) -> set[str]:
-    """Discover all market keys available on an event."""
-    keys: set[str] = set()
-    for bm in event.bookmakers:
-        for m in bm.markets:
-            keys.add(m.key)
-    return keys
+def _rank(items: list[T], key: Callable[[T], float], top_n: int | None) -> list[T]:
+    """Best-first by key; with top_n, select just those instead of sorting everything."""
+    if top_n is not None and top_n < len(items):
+        return heapq.nlargest(top_n, items, key=key)
+    items.sort(key=key, reverse=True)
+    return items
 
 
 def _find_game_ev(
     event: Event,
     ev_bets: list[EVBet],
     now: datetime,
-    selected_books: list[str] | None,
+    selected_books: frozenset[str] | None,
     ev_threshold: float,
     dfs_books: dict[str, float] | None,
     odds_range: tuple[float, float] | None = None,
 ) -> None:
     """Find +EV bets for standard game markets (dynamic discovery for alt lines)."""
-    for market_key in _discover_market_keys(event):
-        book_outcomes: dict[str, list[tuple[Bookmaker, OutcomeOdds]]] = {}
-        for bm in event.bookmakers:
-            outcomes = _get_market_outcomes(bm, market_key)
-            if not outcomes:
-                continue
+    for market_key, books in event.market_index.items():
+        if len(books) < MIN_CONSENSUS_BOOKS:
+            continue  # no outcome can reach the consensus minimum
+        book_outcomes: defaultdict[
+            tuple[str, float | None], list[tuple[Bookmaker, OutcomeOdds]]
+        ] = defaultdict(list)
+        for bm, outcomes in books:
             for outcome in outcomes:
-                key = f"{outcome.name}|{outcome.point}"
-                book_outcomes.setdefault(key, []).append((bm, outcome))
+                book_outcomes[(outcome.name, outcome.point)].append((bm, outcome))
 
-        if not book_outcomes:
+        # Every outcome needs consensus coverage; check before doing any math
+        if not book_outcomes or min(map(len, book_outcomes.values())) < MIN_CONSENSUS_BOOKS:
             continue
 
         no_vig_probs, book_counts = _calculate_market_avg_no_vig(
             book_outcomes,
         )
 
-        min_books = min(book_counts.values()) if book_counts else 0
-        if min_books < 3:
-            continue
-
         _emit_ev_bets(
             event, market_key, book_outcomes, no_vig_probs, book_counts,
             ev_bets, now, selected_books, ev_threshold, dfs_books,
@@ -264,49 +300,41 @@ def _find_prop_ev(
     event: Event,
     ev_bets: list[EVBet],
     now: datetime,
-    selected_books: list[str] | None,
+    selected_books: frozenset[str] | None,
     ev_threshold: float,
     dfs_books: dict[str, float] | None,
     odds_range: tuple[float, float] | None = None,
 ) -> None:
     """Find +EV bets for props — normalizes each (player, point) pair separately."""
-    # Discover all prop market keys on this event
-    market_keys: set[str] = set()
-    for bm in event.bookmakers:
-        for m in bm.markets:
-            market_keys.add(m.key)
-
-    for market_key in market_keys:
+    for market_key, books in event.market_index.items():
+        if len(books) < MIN_CONSENSUS_BOOKS:
+            continue
         # Collect outcomes keyed by (description, point) pair
         # Each pair groups Over + Under at the same line for the same player
-        pairs: dict[str, dict[str, list[tuple[Bookmaker, OutcomeOdds]]]] = {}
+        pairs: defaultdict[
+            tuple[str, float | None], defaultdict[str, list[tuple[Bookmaker, OutcomeOdds]]]
+        ] = defaultdict(lambda: defaultdict(list))
 
-        for bm in event.bookmakers:
-            outcomes = _get_market_outcomes(bm, market_key)
-            if not outcomes:
-                continue
+        for bm, outcomes in books:
             for outcome in outcomes:
                 if not outcome.description:
                     continue
-                pair_key = f"{outcome.description}|{outcome.point}"
-                outcome_key = f"{outcome.description}|{outcome.name}|{outcome.point}"
-                pairs.setdefault(pair_key, {}).setdefault(
-                    outcome_key, []
-                ).append((bm, outcome))
+                # Within a pair, Over/Under is distinguished by name alone
+                pairs[(outcome.description, outcome.point)][outcome.name].append(
+                    (bm, outcome)
+                )
 
         # Process each (player, point) pair independently
         for _pair_key, pair_outcomes in pairs.items():
             if len(pair_outcomes) < 2:
                 continue  # Need both Over and Under
+            if min(map(len, pair_outcomes.values())) < MIN_CONSENSUS_BOOKS:
+                continue
 
             no_vig_probs, book_counts = _calculate_market_avg_no_vig(
                 pair_outcomes,
             )
 
-            min_books = min(book_counts.values()) if book_counts else 0
-            if min_books < 3:
-                continue
-
             _emit_ev_bets(
                 event, market_key, pair_outcomes, no_vig_probs, book_counts,
                 ev_bets, now, selected_books, ev_threshold, dfs_books,
@@ -317,42 +345,50 @@ def _find_prop_ev(
 def _emit_ev_bets(
     event: Event,
     market_key: str,
-    book_outcomes: dict[str, list[tuple[Bookmaker, OutcomeOdds]]],
-    no_vig_probs: dict[str, float],
-    book_counts: dict[str, int],
+    book_outcomes: Mapping[K, list[tuple[Bookmaker, OutcomeOdds]]],
+    no_vig_probs: dict[K, float],
+    book_counts: dict[K, int],
     ev_bets: list[EVBet],
     now: datetime,
-    selected_books: list[str] | None,
+    selected_books: frozenset[str] | None,
     ev_threshold: float,
     dfs_books: dict[str, float] | None,
     is_prop: bool = False,
     odds_range: tuple[float, float] | None = None,
 ) -> None:
     """Check each book's odds against the market consensus and emit EVBet."""
+    lo, hi = odds_range if odds_range is not None else (-math.inf, math.inf)
     for outcome_key, entries in book_outcomes.items():
         no_vig_prob = no_vig_probs.get(outcome_key)
         if no_vig_prob is None or no_vig_prob <= 0 or no_vig_prob >= 1:
             continue
 
-        fair_american = prob_to_american(no_vig_prob)
+        # Most outcomes emit nothing, so the fair price is only worked out
+        # for the first bet that clears the threshold
+        fair_american: float | None = None
         n_books = book_counts.get(outcome_key, 0)
 
         for bm, outcome in entries:
-            if selected_books and bm.key not in selected_books:
+            if selected_books is not None and bm.key not in selected_books:
                 continue
 
-            price = _effective_price(outcome, bm, dfs_books)
+            # DFS books are scored at their configured odds, not their own prices
+            price = dfs_books.get(bm.key, outcome.price) if dfs_books else outcome.price
 
             # Skip bets outside the configured odds range
-            if odds_range is not None:
-                lo, hi = odds_range
-                if price < lo or price > hi:
-                    continue
+            if price < lo or price > hi:
+                continue
 
             decimal_odds = american_to_decimal(price)
-            ev_pct = (no_vig_prob * decimal_odds - 1) * 100
+            edge = no_vig_prob * decimal_odds - 1
+            ev_pct = edge * 100
 
             if ev_pct >= ev_threshold:
+                if fair_american is None:
+                    fair_american = prob_to_american(no_vig_prob)
+                # Plain constructor on purpose: pydantic-core validation of
+                # these scalar fields is faster than model_construct's
+                # Python-level field loop.
                 ev_bets.append(
                     EVBet(
                         sport_key=event.sport_key,
@@ -370,7 +406,7 @@ def _emit_ev_bets(
                         no_vig_prob=no_vig_prob,
                         fair_odds=fair_american,
                         ev_percentage=ev_pct,
-                        edge=no_vig_prob * decimal_odds - 1,
+                        edge=edge,
                         detected_at=now,
                         num_books=n_books,
                         player_name=outcome.description if is_prop else None,
@@ -380,8 +416,8 @@ def _emit_ev_bets(
 
 
 def _calculate_market_avg_no_vig(
-    book_outcomes: dict[str, list[tuple[Bookmaker, OutcomeOdds]]],
-) -> tuple[dict[str, float], dict[str, int]]:
+    book_outcomes: Mapping[K, list[tuple[Bookmaker, OutcomeOdds]]],
+) -> tuple[dict[K, float], dict[K, int]]:
     """Calculate no-vig probabilities from market average across all books.
 
     Outcomes passed in should be a related group (e.g. Over + Under at the
@@ -392,22 +428,20 @@ def _calculate_market_avg_no_vig(
 
     Returns (no_vig_probs, book_counts).
     """
-    no_vig: dict[str, float] = {}
-    counts: dict[str, int] = {}
-
-    avg_probs: dict[str, list[float]] = {}
+    raw_probs: dict[K, float] = {}
+    counts: dict[K, int] = {}
+    total = 0.0
+    implied = american_to_implied_prob  # innermost loop of every EV scan
     for outcome_key, entries in book_outcomes.items():
-        for bm, outcome in entries:
-            avg_probs.setdefault(outcome_key, []).append(
-                american_to_implied_prob(outcome.price)
-            )
-
-    raw_probs = {k: sum(v) / len(v) for k, v in avg_probs.items() if v}
-    for k, v in avg_probs.items():
-        counts[k] = len(v)
+        if not entries:
+            continue
+        avg = sum(implied(outcome.price) for _bm, outcome in entries) / len(entries)
+        raw_probs[outcome_key] = avg
+        counts[outcome_key] = len(entries)
+        total += avg
 
     # Normalize to remove vig (sum to 1)
-    total = sum(raw_probs.values())
+    no_vig: dict[K, float] = {}
     if total > 0:
         for k, p in raw_probs.items():
             no_vig[k] = p / total
@@ -422,6 +456,7 @@ def find_arb_bets(
     events: list[Event],
     min_profit_pct: float = 0.1,
     dfs_books: dict[str, float] | None = None,
+    top_n: int | None = None,
 ) -> list[ArbBet]:
     """Find two-leg arbitrage opportunities across all events/markets.
 
@@ -431,15 +466,16 @@ def find_arb_bets(
     arbs: list[ArbBet] = []
     _featured = {"h2h", "spreads", "totals"}
     for event in events:
-        for market_key in _discover_market_keys(event) & _featured:
-            _find_market_arbs(event, market_key, arbs, min_profit_pct, dfs_books)
-    arbs.sort(key=lambda a: a.profit_pct, reverse=True)
-    return arbs
+        for market_key, books in event.market_index.items():
+            if market_key in _featured:
+                _find_market_arbs(event, market_key, books, arbs, min_profit_pct, dfs_books)
+    return _rank(arbs, lambda a: a.profit_pct, top_n)
 
 
 def _find_market_arbs(
     event: Event,
     market_key: str,
+    books: list[tuple[Bookmaker, list[OutcomeOdds]]],
     arbs: list[ArbBet],
     min_profit_pct: float,
     dfs_books: dict[str, float] | None,
@@ -455,12 +491,12 @@ def _find_market_arbs(
     # Group outcomes by the line they belong to. For spreads/totals,
     # group by point so we only compare same-line sides.
     # For h2h, all outcomes share the same "line" (None).
-    line_groups: dict[float | None, dict[str, list[tuple[Bookmaker, OutcomeOdds]]]] = {}
+    line_groups: defaultdict[
+        float | None,
+        defaultdict[tuple[str, float | None], list[tuple[Bookmaker, OutcomeOdds]]],
+    ] = defaultdict(lambda: defaultdict(list))
 
-    for bm in event.bookmakers:
-        outcomes = _get_market_outcomes(bm, market_key)
-        if not outcomes:
-            continue
+    for bm, outcomes in books:
         for outcome in outcomes:
             # For spreads, both sides have the same absolute spread
             # (e.g., -3.5 and +3.5). Group by |point| so they match.
@@ -473,10 +509,8 @@ def _find_market_arbs(
             else:
                 line_key = None
 
-            side_key = f"{outcome.name}|{outcome.point}"
-            line_groups.setdefault(line_key, {}).setdefault(side_key, []).append(
-                (bm, outcome)
-            )
+            side_key = (outcome.name, outcome.point)
+            line_groups[line_key][side_key].append((bm, outcome))
 
     # For each line group, find arbs among its sides
     for _line, sides in line_groups.items():
@@ -484,47 +518,45 @@ def _find_market_arbs(
             continue
 
         # Find best price per side
-        best_per_side: dict[str, tuple[float, Bookmaker, OutcomeOdds]] = {}
+        best_per_side: dict[
+            tuple[str, float | None], tuple[float, Bookmaker, OutcomeOdds]
+        ] = {}
         for side_key, entries in sides.items():
             for bm, outcome in entries:
-                price = _effective_price(outcome, bm, dfs_books)
+                price = dfs_books.get(bm.key, outcome.price) if dfs_books else outcome.price
                 if side_key not in best_per_side or price > best_per_side[side_key][0]:
                     best_per_side[side_key] = (price, bm, outcome)
 
         # Check all pairs within this line group
-        side_keys = list(best_per_side.keys())
-        for i in range(len(side_keys)):
-            for j in range(i + 1, len(side_keys)):
-                key_a, key_b = side_keys[i], side_keys[j]
-                price_a, bm_a, out_a = best_per_side[key_a]
-                price_b, bm_b, out_b = best_per_side[key_b]
-
-                imp_a = american_to_implied_prob(price_a)
-                imp_b = american_to_implied_prob(price_b)
-                imp_sum = imp_a + imp_b
-
-                if imp_sum < 1.0:
-                    profit = (1.0 / imp_sum - 1.0) * 100
-                    if profit >= min_profit_pct:
-                        arbs.append(ArbBet(
-                            sport_key=event.sport_key,
-                            event_id=event.id,
-                            home_team=event.home_team,
-                            away_team=event.away_team,
-                            market=market_key,
-                            book_a=bm_a.key,
-                            book_a_title=bm_a.title,
-                            outcome_a=out_a.name,
-                            odds_a=price_a,
-                            point_a=out_a.point,
-                            book_b=bm_b.key,
-                            book_b_title=bm_b.title,
-                            outcome_b=out_b.name,
-                            odds_b=price_b,
-                            point_b=out_b.point,
-                            profit_pct=profit,
-                            implied_sum=imp_sum,
-                        ))
+        for (price_a, bm_a, out_a), (price_b, bm_b, out_b) in combinations(
+            best_per_side.values(), 2,
+        ):
+            imp_a = american_to_implied_prob(price_a)
+            imp_b = american_to_implied_prob(price_b)
+            imp_sum = imp_a + imp_b
+
+            if imp_sum < 1.0:
+                profit = (1.0 / imp_sum - 1.0) * 100
+                if profit >= min_profit_pct:
+                    arbs.append(ArbBet(
+                        sport_key=event.sport_key,
+                        event_id=event.id,
+                        home_team=event.home_team,
+                        away_team=event.away_team,
+                        market=market_key,
+                        book_a=bm_a.key,
+                        book_a_title=bm_a.title,
+                        outcome_a=out_a.name,
+                        odds_a=price_a,
+                        point_a=out_a.point,
+                        book_b=bm_b.key,
+                        book_b_title=bm_b.title,
+                        outcome_b=out_b.name,
+                        odds_b=price_b,
+                        point_b=out_b.point,
+                        profit_pct=profit,
+                        implied_sum=imp_sum,
+                    ))
 
 
 # ── Middles detection ──
@@ -545,6 +577,10 @@ _POINT_DENSITY: dict[str, float] = {
 _DEFAULT_POINT_DENSITY = 0.04
 
 
+# Middle finders keep (point, price, implied, bm) line tuples
+_line_point = itemgetter(0)
+
+
 def _estimate_middle_hit_prob(
     window_size: float, sport_key: str, market_key: str,
 ) -> float:
@@ -563,7 +599,8 @@ def _estimate_middle_hit_prob(
     # For spreads: -3 / +4.5 → margin of victory 4 → 1 spot (exactly 4)
     # General: floor(window) spots if both endpoints are half-points,
     # otherwise floor(window) spots. This is approximate.
-    landing_spots = max(1, math.floor(window_size))
+    # int() truncates toward zero; the max() makes that match floor() here
+    landing_spots = max(1, int(window_size))
 
     # Cap at a reasonable probability (a 10-point window isn't 35%)
     hit_prob = min(landing_spots * density, 0.30)
@@ -602,6 +639,7 @@ def find_middle_bets(
     min_window: float = 0.5,
     max_combined_cost: float = 1.08,
     dfs_books: dict[str, float] | None = None,
+    top_n: int | None = None,
 ) -> list[MiddleBet]:
     """Find cross-line middle opportunities.
 
@@ -613,17 +651,19 @@ def find_middle_bets(
     """
     middles: list[MiddleBet] = []
     for event in events:
-        for market_key in _discover_market_keys(event) & {"spreads", "totals"}:
-            _find_market_middles(
-                event, market_key, middles, min_window, max_combined_cost, dfs_books,
-            )
-    middles.sort(key=lambda m: m.ev_percentage, reverse=True)
-    return middles
+        for market_key, books in event.market_index.items():
+            if market_key in ("spreads", "totals"):
+                _find_market_middles(
+                    event, market_key, books, middles, min_window, max_combined_cost,
+                    dfs_books,
+                )
+    return _rank(middles, lambda m: m.ev_percentage, top_n)
 
 
 def _find_market_middles(
     event: Event,
     market_key: str,
+    books: list[tuple[Bookmaker, list[OutcomeOdds]]],
     middles: list[MiddleBet],
     min_window: float,
     max_combined_cost: float,
@@ -631,113 +671,123 @@ def _find_market_middles(
 ) -> None:
     """Find middles in a single market."""
     if "spread" in market_key:
-        _find_spread_middles(event, market_key, middles, min_window, max_combined_cost, dfs_books)
+        _find_spread_middles(
+            event, market_key, books, middles, min_window, max_combined_cost, dfs_books,
+        )
     elif "total" in market_key:
-        _find_total_middles(event, market_key, middles, min_window, max_combined_cost, dfs_books)
+        _find_total_middles(
+            event, market_key, books, middles, min_window, max_combined_cost, dfs_books,
+        )
 
 
 def _find_spread_middles(
     event: Event,
     market_key: str,
+    books: list[tuple[Bookmaker, list[OutcomeOdds]]],
     middles: list[MiddleBet],
     min_window: float,
     max_combined_cost: float,
     dfs_books: dict[str, float] | None,
 ) -> None:
     """Find spread middles: same team at different lines across books."""
-    # Collect (team_name → [(point, price, bm)]) ignoring point grouping
-    team_lines: dict[str, list[tuple[float, float, Bookmaker]]] = {}
-    for bm in event.bookmakers:
-        outcomes = _get_market_outcomes(bm, market_key)
-        if not outcomes:
-            continue
+    # Collect (team_name → [(point, price, implied, bm)]) ignoring point grouping.
+    # Implied prob is converted once per line here, not once per candidate pair.
+    team_lines: defaultdict[str, list[tuple[float, float, float, Bookmaker]]] = defaultdict(list)
+    for bm, outcomes in books:
         for out in outcomes:
             if out.point is None:
                 continue
-            price = _effective_price(out, bm, dfs_books)
-            team_lines.setdefault(out.name, []).append((out.point, price, bm))
+            price = dfs_books.get(bm.key, out.price) if dfs_books else out.price
+            team_lines[out.name].append(
+                (out.point, price, american_to_implied_prob(price), bm)
+            )
+
+    # Sorted by point so each pairing can skip lines that can't open a window
+    team_points: dict[str, list[float]] = {}
+    for team, lines in team_lines.items():
+        lines.sort(key=_line_point)
+        team_points[team] = [line[0] for line in lines]
 
     # For each pair of teams (A, B), check if A's spread + B's spread create a window
-    teams = list(team_lines.keys())
-    for i in range(len(teams)):
-        for j in range(i + 1, len(teams)):
-            team_a, team_b = teams[i], teams[j]
-            for pt_a, price_a, bm_a in team_lines[team_a]:
-                for pt_b, price_b, bm_b in team_lines[team_b]:
-                    if bm_a.key == bm_b.key:
-                        continue
-                    # Middle exists if pt_a + pt_b > 0
-                    # e.g., Team A -3, Team B +4 → window = |(-3) + 4| = 1
-                    window = pt_a + pt_b
-                    if window >= min_window:
-                        imp_a = american_to_implied_prob(price_a)
-                        imp_b = american_to_implied_prob(price_b)
-                        cost = imp_a + imp_b
-                        if cost <= max_combined_cost:
-                            low = min(-pt_a, pt_b)
-                            high = max(-pt_a, pt_b)
-                            hp = _estimate_middle_hit_prob(
-                                window, event.sport_key, market_key,
-                            )
-                            ev_pct = _compute_middle_ev(price_a, price_b, hp)
-                            middles.append(MiddleBet(
-                                sport_key=event.sport_key,
-                                event_id=event.id,
-                                home_team=event.home_team,
-                                away_team=event.away_team,
-                                market=market_key,
-                                book_a=bm_a.key,
-                                book_a_title=bm_a.title,
-                                line_a=pt_a,
-                                odds_a=price_a,
-                                outcome_a=team_a,
-                                book_b=bm_b.key,
-                                book_b_title=bm_b.title,
-                                line_b=pt_b,
-                                odds_b=price_b,
-                                outcome_b=team_b,
-                                middle_low=low,
-                                middle_high=high,
-                                window_size=window,
-                                combined_cost=cost,
-                                hit_prob=hp,
-                                ev_percentage=ev_pct,
-                            ))
+    for team_a, team_b in combinations(team_lines, 2):
+        lines_b = team_lines[team_b]
+        points_b = team_points[team_b]
+        for pt_a, price_a, imp_a, bm_a in team_lines[team_a]:
+            start = bisect_left(points_b, min_window - pt_a)
+            for pt_b, price_b, imp_b, bm_b in lines_b[start:]:
+                if bm_a.key == bm_b.key:
+                    continue
+                # Middle exists if pt_a + pt_b > 0
+                # e.g., Team A -3, Team B +4 → window = |(-3) + 4| = 1
+                window = pt_a + pt_b
+                if window >= min_window:
+                    cost = imp_a + imp_b
+                    if cost <= max_combined_cost:
+                        low = min(-pt_a, pt_b)
+                        high = max(-pt_a, pt_b)
+                        hp = _estimate_middle_hit_prob(
+                            window, event.sport_key, market_key,
+                        )
+                        ev_pct = _compute_middle_ev(price_a, price_b, hp)
+                        middles.append(MiddleBet(
+                            sport_key=event.sport_key,
+                            event_id=event.id,
+                            home_team=event.home_team,
+                            away_team=event.away_team,
+                            market=market_key,
+                            book_a=bm_a.key,
+                            book_a_title=bm_a.title,
+                            line_a=pt_a,
+                            odds_a=price_a,
+                            outcome_a=team_a,
+                            book_b=bm_b.key,
+                            book_b_title=bm_b.title,
+                            line_b=pt_b,
+                            odds_b=price_b,
+                            outcome_b=team_b,
+                            middle_low=low,
+                            middle_high=high,
+                            window_size=window,
+                            combined_cost=cost,
+                            hit_prob=hp,
+                            ev_percentage=ev_pct,
+                        ))
 
 
 def _find_total_middles(
     event: Event,
     market_key: str,
+    books: list[tuple[Bookmaker, list[OutcomeOdds]]],
     middles: list[MiddleBet],
     min_window: float,
     max_combined_cost: float,
     dfs_books: dict[str, float] | None,
 ) -> None:
     """Find total middles: Over X at one book, Under Y at another where Y > X."""
-    overs: list[tuple[float, float, Bookmaker]] = []
-    unders: list[tuple[float, float, Bookmaker]] = []
+    # (point, price, implied, bm), implied converted once per line
+    overs: list[tuple[float, float, float, Bookmaker]] = []
+    unders: list[tuple[float, float, float, Bookmaker]] = []
 
-    for bm in event.bookmakers:
-        outcomes = _get_market_outcomes(bm, market_key)
-        if not outcomes:
-            continue
+    for bm, outcomes in books:
         for out in outcomes:
             if out.point is None:
                 continue
-            price = _effective_price(out, bm, dfs_books)
+            price = dfs_books.get(bm.key, out.price) if dfs_books else out.price
             if out.name == "Over":
-                overs.append((out.point, price, bm))
+                overs.append((out.point, price, american_to_implied_prob(price), bm))
             elif out.name == "Under":
-                unders.append((out.point, price, bm))
-
-    for ov_pt, ov_price, ov_bm in overs:
-        for un_pt, un_price, un_bm in unders:
+                unders.append((out.point, price, american_to_implied_prob(price), bm))
+
+    unders.sort(key=_line_point)
+    under_points = [line[0] for line in unders]
+    for ov_pt, ov_price, imp_ov, ov_bm in overs:
+        # Unders below ov_pt + min_window can't open a window
+        start = bisect_left(under_points, ov_pt + min_window)
+        for un_pt, un_price, imp_un, un_bm in unders[start:]:
             if ov_bm.key == un_bm.key:
                 continue
             window = un_pt - ov_pt
             if window >= min_window:
-                imp_ov = american_to_implied_prob(ov_price)
-                imp_un = american_to_implied_prob(un_price)
                 cost = imp_ov + imp_un
                 if cost <= max_combined_cost:
                     hp = _estimate_middle_hit_prob(
@@ -776,6 +826,7 @@ def find_prop_arb_bets(
     events: list[Event],
     min_profit_pct: float = 0.1,
     dfs_books: dict[str, float] | None = None,
+    top_n: int | None = None,
 ) -> list[ArbBet]:
     """Find two-leg arb opportunities on player props.
 
@@ -784,37 +835,34 @@ def find_prop_arb_bets(
     """
     arbs: list[ArbBet] = []
     for event in events:
-        for market_key in _discover_market_keys(event):
+        for market_key, books in event.market_index.items():
             _find_prop_market_arbs(
-                event, market_key, arbs, min_profit_pct, dfs_books,
+                event, market_key, books, arbs, min_profit_pct, dfs_books,
             )
-    arbs.sort(key=lambda a: a.profit_pct, reverse=True)
-    return arbs
+    return _rank(arbs, lambda a: a.profit_pct, top_n)
 
 
 def _find_prop_market_arbs(
     event: Event,
     market_key: str,
+    books: list[tuple[Bookmaker, list[OutcomeOdds]]],
     arbs: list[ArbBet],
     min_profit_pct: float,
     dfs_books: dict[str, float] | None,
 ) -> None:
     """Find arbs in a single prop market — same player, same line."""
     # Group by (player, point) → side → best price
-    groups: dict[str, dict[str, list[tuple[float, Bookmaker, OutcomeOdds]]]] = {}
+    groups: defaultdict[
+        tuple[str, float], defaultdict[str, list[tuple[float, Bookmaker, OutcomeOdds]]]
+    ] = defaultdict(lambda: defaultdict(list))
 
-    for bm in event.bookmakers:
-        outcomes = _get_market_outcomes(bm, market_key)
-        if not outcomes:
-            continue
+    for bm, outcomes in books:
         for out in outcomes:
             if not out.description or out.point is None:
                 continue
-            group_key = f"{out.description}|{out.point}"
-            price = _effective_price(out, bm, dfs_books)
-            groups.setdefault(group_key, {}).setdefault(out.name, []).append(
-                (price, bm, out)
-            )
+            group_key = (out.description, out.point)
+            price = dfs_books.get(bm.key, out.price) if dfs_books else out.price
+            groups[group_key][out.name].append((price, bm, out))
 
     for group_key, sides in groups.items():
         if len(sides) < 2:
@@ -828,41 +876,37 @@ def _find_prop_market_arbs(
                     best_per_side[side_name] = (price, bm, out)
 
         # Check all pairs
-        side_names = list(best_per_side.keys())
-        for i in range(len(side_names)):
-            for j in range(i + 1, len(side_names)):
-                name_a, name_b = side_names[i], side_names[j]
-                price_a, bm_a, out_a = best_per_side[name_a]
-                price_b, bm_b, out_b = best_per_side[name_b]
-
-                imp_a = american_to_implied_prob(price_a)
-                imp_b = american_to_implied_prob(price_b)
-                imp_sum = imp_a + imp_b
-
-                if imp_sum < 1.0:
-                    profit = (1.0 / imp_sum - 1.0) * 100
-                    if profit >= min_profit_pct:
-                        arbs.append(ArbBet(
-                            sport_key=event.sport_key,
-                            event_id=event.id,
-                            home_team=event.home_team,
-                            away_team=event.away_team,
-                            market=market_key,
-                            book_a=bm_a.key,
-                            book_a_title=bm_a.title,
-                            outcome_a=out_a.name,
-                            odds_a=price_a,
-                            point_a=out_a.point,
-                            book_b=bm_b.key,
-                            book_b_title=bm_b.title,
-                            outcome_b=out_b.name,
-                            odds_b=price_b,
-                            point_b=out_b.point,
-                            profit_pct=profit,
-                            implied_sum=imp_sum,
-                            player_name=out_a.description,
-                            is_prop=True,
-                        ))
+        for (price_a, bm_a, out_a), (price_b, bm_b, out_b) in combinations(
+            best_per_side.values(), 2,
+        ):
+            imp_a = american_to_implied_prob(price_a)
+            imp_b = american_to_implied_prob(price_b)
+            imp_sum = imp_a + imp_b
+
+            if imp_sum < 1.0:
+                profit = (1.0 / imp_sum - 1.0) * 100
+                if profit >= min_profit_pct:
+                    arbs.append(ArbBet(
+                        sport_key=event.sport_key,
+                        event_id=event.id,
+                        home_team=event.home_team,
+                        away_team=event.away_team,
+                        market=market_key,
+                        book_a=bm_a.key,
+                        book_a_title=bm_a.title,
+                        outcome_a=out_a.name,
+                        odds_a=price_a,
+                        point_a=out_a.point,
+                        book_b=bm_b.key,
+                        book_b_title=bm_b.title,
+                        outcome_b=out_b.name,
+                        odds_b=price_b,
+                        point_b=out_b.point,
+                        profit_pct=profit,
+                        implied_sum=imp_sum,
+                        player_name=out_a.description,
+                        is_prop=True,
+                    ))
 
 
 # ── Prop Middles detection ──
@@ -873,6 +917,7 @@ def find_prop_middle_bets(
     min_window: float = 0.5,
     max_combined_cost: float = 1.08,
     dfs_books: dict[str, float] | None = None,
+    top_n: int | None = None,
 ) -> list[MiddleBet]:
     """Find cross-line middle opportunities on player props.
 
@@ -881,42 +926,44 @@ def find_prop_middle_bets(
     """
     middles: list[MiddleBet] = []
     for event in events:
-        for market_key in _discover_market_keys(event):
+        for market_key, books in event.market_index.items():
             _find_prop_market_middles(
-                event, market_key, middles, min_window, max_combined_cost, dfs_books,
+                event, market_key, books, middles, min_window, max_combined_cost,
+                dfs_books,
             )
-    middles.sort(key=lambda m: m.ev_percentage, reverse=True)
-    return middles
+    return _rank(middles, lambda m: m.ev_percentage, top_n)
 
 
 def _find_prop_market_middles(
     event: Event,
     market_key: str,
+    books: list[tuple[Bookmaker, list[OutcomeOdds]]],
     middles: list[MiddleBet],
     min_window: float,
     max_combined_cost: float,
     dfs_books: dict[str, float] | None,
 ) -> None:
     """Find middles in a single prop market for each player."""
-    # Group by player → collect Overs and Unders with their lines
-    player_overs: dict[str, list[tuple[float, float, Bookmaker]]] = {}
-    player_unders: dict[str, list[tuple[float, float, Bookmaker]]] = {}
-
-    for bm in event.bookmakers:
-        outcomes = _get_market_outcomes(bm, market_key)
-        if not outcomes:
-            continue
+    # Group by player → collect Overs and Unders as (point, price, implied, bm)
+    player_overs: defaultdict[str, list[tuple[float, float, float, Bookmaker]]] = (
+        defaultdict(list)
+    )
+    player_unders: defaultdict[str, list[tuple[float, float, float, Bookmaker]]] = (
+        defaultdict(list)
+    )
+
+    for bm, outcomes in books:
         for out in outcomes:
             if not out.description or out.point is None:
                 continue
-            price = _effective_price(out, bm, dfs_books)
+            price = dfs_books.get(bm.key, out.price) if dfs_books else out.price
             if out.name == "Over":
-                player_overs.setdefault(out.description, []).append(
-                    (out.point, price, bm)
+                player_overs[out.description].append(
+                    (out.point, price, american_to_implied_prob(price), bm)
                 )
             elif out.name == "Under":
-                player_unders.setdefault(out.description, []).append(
-                    (out.point, price, bm)
+                player_unders[out.description].append(
+                    (out.point, price, american_to_implied_prob(price), bm)
                 )
 
     # For each player, find Over X / Under Y cross-line opportunities
@@ -924,16 +971,16 @@ def _find_prop_market_middles(
         if player not in player_unders:
             continue
         overs = player_overs[player]
-        unders = player_unders[player]
+        unders = sorted(player_unders[player], key=_line_point)
+        under_points = [line[0] for line in unders]
 
-        for ov_pt, ov_price, ov_bm in overs:
-            for un_pt, un_price, un_bm in unders:
+        for ov_pt, ov_price, imp_ov, ov_bm in overs:
+            start = bisect_left(under_points, ov_pt + min_window)
+            for un_pt, un_price, imp_un, un_bm in unders[start:]:
                 if ov_bm.key == un_bm.key:
                     continue
                 window = un_pt - ov_pt
                 if window >= min_window:
-                    imp_ov = american_to_implied_prob(ov_price)
-                    imp_un = american_to_implied_prob(un_price)
                     cost = imp_ov + imp_un
                     if cost <= max_combined_cost:
                         hp = _estimate_middle_hit_prob(
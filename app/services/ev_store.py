@@ -3,20 +3,43 @@
 from __future__ import annotations
 
 import sqlite3
-from datetime import datetime
+import threading
+from datetime import datetime, timezone
 from pathlib import Path
 
 from app.services.ev import EVBet
 
 DB_PATH = Path(__file__).resolve().parent.parent.parent / "ev_history.db"
 
+_UNIX_EPOCH_JD = 2440587.5
+
+
+def _local_julian_day() -> float:
+    """Julian day of the local wall-clock time, as julianday('now', 'localtime').
+
+    detected_at is stored as naive local time, so the current time is read
+    the same way rather than as UTC.
+    """
+    return datetime.now().replace(tzinfo=timezone.utc).timestamp() / 86400 + _UNIX_EPOCH_JD
+
 
 class EVStore:
-    """Stores and queries EV bet history in SQLite."""
+    """Stores and queries EV bet history in SQLite.
+
+    Writes come in from worker threads (``asyncio.to_thread``) on one shared
+    connection, and a cancelled scan's thread can still be running when the
+    next one starts, so every write transaction holds ``_write_lock``. That
+    also keeps two scans from interleaving on the shared ``current_keys``
+    table.
+    """
 
     def __init__(self, db_path: Path = DB_PATH) -> None:
+        self._write_lock = threading.Lock()
         self._conn = sqlite3.connect(str(db_path), check_same_thread=False)
         self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("PRAGMA temp_store=MEMORY")
         self._create_tables()
 
     def _create_tables(self) -> None:
@@ -46,59 +69,92 @@ class EVStore:
                 UNIQUE(book, event_id, market, outcome_name, outcome_point_str, player_name)
             )
         """)
+        # Cover get_active_for_sport's filter and ordering so it doesn't scan
+        # the whole history
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_ev_active "
+            "ON ev_bets(sport_key, is_prop, is_active, ev_percentage DESC)"
+        )
+        # The staleness sweeps only touch active rows, which are a small slice
+        # of a long-lived history, so they get a partial index
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_ev_active_partial "
+            "ON ev_bets(sport_key, is_prop, event_id) WHERE is_active = 1"
+        )
+        # Scratch table holding the current scan's keys for _deactivate_missing
+        self._conn.execute("""
+            CREATE TEMP TABLE IF NOT EXISTS current_keys (
+                book TEXT, event_id TEXT, market TEXT, outcome_name TEXT,
+                outcome_point_str TEXT, player_name TEXT,
+                PRIMARY KEY (book, event_id, market, outcome_name, outcome_point_str, player_name)
+            ) WITHOUT ROWID
+        """)
         self._conn.commit()
 
     def upsert_bets(self, bets: list[EVBet]) -> None:
         """Insert new bets or update existing ones."""
+        with self._write_lock, self._conn:
+            self._upsert(bets)
+
+    def sync_sport(
+        self, sport_key: str, bets: list[EVBet], *, is_props: bool = False,
+    ) -> None:
+        """Upsert the current scan and deactivate the rest in one transaction."""
+        with self._write_lock, self._conn:
+            if bets:
+                self._upsert(bets)
+            self._deactivate_missing(sport_key, bets, is_props)
+
+    def _upsert(self, bets: list[EVBet]) -> None:
         now = datetime.now().isoformat()
-        for bet in bets:
-            pt_str = str(bet.outcome_point) if bet.outcome_point is not None else ""
-            player = bet.player_name or ""
-            self._conn.execute("""
-                INSERT INTO ev_bets
-                    (sport_key, book, book_title, event_id, home_team, away_team,
-                     market, outcome_name, outcome_point_str, odds, fair_odds,
-                     no_vig_prob, ev_percentage, edge, num_books,
-                     detected_at, last_seen_at, is_active,
-                     player_name, is_prop)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, 1, ?, ?)
-                ON CONFLICT(book, event_id, market, outcome_name, outcome_point_str, player_name)
-                DO UPDATE SET
-                    odds = excluded.odds,
-                    fair_odds = excluded.fair_odds,
-                    no_vig_prob = excluded.no_vig_prob,
-                    ev_percentage = excluded.ev_percentage,
-                    edge = excluded.edge,
-                    num_books = excluded.num_books,
-                    last_seen_at = excluded.last_seen_at,
-                    is_active = 1
-            """, (
+        self._conn.executemany("""
+            INSERT INTO ev_bets
+                (sport_key, book, book_title, event_id, home_team, away_team,
+                 market, outcome_name, outcome_point_str, odds, fair_odds,
+                 no_vig_prob, ev_percentage, edge, num_books,
+                 detected_at, last_seen_at, is_active,
+                 player_name, is_prop)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, COALESCE(?, ?), ?, 1, ?, ?)
+            ON CONFLICT(book, event_id, market, outcome_name, outcome_point_str, player_name)
+            DO UPDATE SET
+                odds = excluded.odds,
+                fair_odds = excluded.fair_odds,
+                no_vig_prob = excluded.no_vig_prob,
+                ev_percentage = excluded.ev_percentage,
+                edge = excluded.edge,
+                num_books = excluded.num_books,
+                last_seen_at = excluded.last_seen_at,
+                is_active = 1
+        """, [
+            (
                 bet.sport_key, bet.book, bet.book_title, bet.event_id,
                 bet.home_team, bet.away_team, bet.market,
-                bet.outcome_name, pt_str,
+                bet.outcome_name,
+                str(bet.outcome_point) if bet.outcome_point is not None else "",
                 bet.odds, bet.fair_odds, bet.no_vig_prob,
                 bet.ev_percentage, bet.edge, bet.num_books,
-                bet.detected_at.isoformat() if bet.detected_at else now,
+                bet.detected_at.isoformat() if bet.detected_at else None, now,
                 now,
-                player, 1 if bet.is_prop else 0,
-            ))
-        self._conn.commit()
+                bet.player_name or "", 1 if bet.is_prop else 0,
+            )
+            for bet in bets
+        ])
 
     def mark_stale_for_sport(self, sport_key: str, active_event_ids: set[str]) -> None:
         """Mark bets inactive if their event is gone from the current feed."""
-        if not active_event_ids:
-            self._conn.execute(
-                "UPDATE ev_bets SET is_active = 0 WHERE sport_key = ? AND is_active = 1",
-                (sport_key,),
-            )
-        else:
-            placeholders = ",".join("?" * len(active_event_ids))
-            self._conn.execute(f"""
-                UPDATE ev_bets SET is_active = 0
-                WHERE sport_key = ? AND is_active = 1
-                AND event_id NOT IN ({placeholders})
-            """, [sport_key] + list(active_event_ids))
-        self._conn.commit()
+        with self._write_lock, self._conn:
+            if not active_event_ids:
+                self._conn.execute(
+                    "UPDATE ev_bets SET is_active = 0 WHERE sport_key = ? AND is_active = 1",
+                    (sport_key,),
+                )
+            else:
+                placeholders = ",".join("?" * len(active_event_ids))
+                self._conn.execute(f"""
+                    UPDATE ev_bets SET is_active = 0
+                    WHERE sport_key = ? AND is_active = 1
+                    AND event_id NOT IN ({placeholders})
+                """, [sport_key] + list(active_event_ids))
 
     def deactivate_missing(
         self, sport_key: str, current_bets: list[EVBet], *, is_props: bool = False,
@@ -107,6 +163,12 @@ class EVStore:
 
         Scopes by is_prop so game and prop deactivations don't interfere.
         """
+        with self._write_lock, self._conn:
+            self._deactivate_missing(sport_key, current_bets, is_props)
+
+    def _deactivate_missing(
+        self, sport_key: str, current_bets: list[EVBet], is_props: bool,
+    ) -> None:
         prop_val = 1 if is_props else 0
 
         if not current_bets:
@@ -115,39 +177,27 @@ class EVStore:
                 "WHERE sport_key = ? AND is_active = 1 AND is_prop = ?",
                 (sport_key, prop_val),
             )
-            self._conn.commit()
             return
 
-        # Build set of current bet keys
-        current_keys = set()
-        for b in current_bets:
-            pt = str(b.outcome_point) if b.outcome_point is not None else ""
-            player = b.player_name or ""
-            current_keys.add((b.book, b.event_id, b.market, b.outcome_name, pt, player))
-
-        # Get all active bets for this sport scoped by prop type
-        rows = self._conn.execute(
-            "SELECT id, book, event_id, market, outcome_name, outcome_point_str, player_name "
-            "FROM ev_bets WHERE sport_key = ? AND is_active = 1 AND is_prop = ?",
-            (sport_key, prop_val),
-        ).fetchall()
-
-        stale_ids = []
-        for r in rows:
-            key = (
-                r["book"], r["event_id"], r["market"],
-                r["outcome_name"], r["outcome_point_str"], r["player_name"],
-            )
-            if key not in current_keys:
-                stale_ids.append(r["id"])
-
-        if stale_ids:
-            placeholders = ",".join("?" * len(stale_ids))
-            self._conn.execute(
-                f"UPDATE ev_bets SET is_active = 0 WHERE id IN ({placeholders})",
-                stale_ids,
-            )
-            self._conn.commit()
+        # Anti-join against the scan's keys in SQL rather than diffing in Python
+        self._conn.execute("DELETE FROM current_keys")
+        self._conn.executemany(
+            "INSERT OR IGNORE INTO current_keys VALUES (?, ?, ?, ?, ?, ?)",
+            [
+                (
+                    b.book, b.event_id, b.market, b.outcome_name,
+                    str(b.outcome_point) if b.outcome_point is not None else "",
+                    b.player_name or "",
+                )
+                for b in current_bets
+            ],
+        )
+        self._conn.execute("""
+            UPDATE ev_bets SET is_active = 0
+            WHERE sport_key = ? AND is_active = 1 AND is_prop = ?
+            AND (book, event_id, market, outcome_name, outcome_point_str, player_name)
+                NOT IN (SELECT * FROM current_keys)
+        """, (sport_key, prop_val))
 
     def get_active_for_sport(
         self, sport_key: str, limit: int = 40, *, is_props: bool = False,
@@ -156,14 +206,15 @@ class EVStore:
         prop_val = 1 if is_props else 0
         rows = self._conn.execute("""
             SELECT *,
-                ROUND((julianday('now', 'localtime') - julianday(detected_at)) * 24 * 60, 1)
-                    AS minutes_active
+                ROUND((? - julianday(detected_at)) * 24 * 60, 1) AS minutes_active
             FROM ev_bets
             WHERE is_active = 1 AND sport_key = ? AND is_prop = ?
             ORDER BY ev_percentage DESC
             LIMIT ?
-        """, (sport_key, prop_val, limit)).fetchall()
+        """, (_local_julian_day(), sport_key, prop_val, limit)).fetchall()
         return [dict(r) for r in rows]
 
     def close(self) -> None:
+        # Refresh planner statistics for the indexes if they've gone stale
+        self._conn.execute("PRAGMA optimize")
         self._conn.close()
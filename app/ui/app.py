@@ -2,7 +2,10 @@
 
 from __future__ import annotations
 
+import asyncio
+import functools
 import logging
+import time
 from pathlib import Path
 
 from textual.app import App, ComposeResult
@@ -10,6 +13,7 @@ from textual.binding import Binding
 from textual.containers import ScrollableContainer
 from textual.widgets import Static
 
+from app.api.models import Sport
 from app.config import Settings, load_settings
 from app.services.data_service import DataService
 from app.ui.widgets.arb_panel import ArbPanel
@@ -33,16 +37,16 @@ class OddsTickerApp(App):
 
     BINDINGS = [
         Binding("q", "quit", "Quit", priority=True),
-        Binding("right", "next_sport", "Next Sport", show=False),
-        Binding("left", "prev_sport", "Prev Sport", show=False),
+        Binding("right", "nav(1)", "Next Sport", show=False),
+        Binding("left", "nav(-1)", "Prev Sport", show=False),
         Binding("r", "refresh", "Refresh", show=False),
         Binding("m", "toggle_middles", "Middles Panel", show=False),
         Binding("e", "toggle_ev", "Toggle EV", show=False),
         Binding("p", "toggle_props", "Props", show=False),
         Binding("s", "toggle_settings", "Settings", show=False),
-        Binding("1", "market_h2h", "Moneyline", show=False),
-        Binding("2", "market_spreads", "Spread", show=False),
-        Binding("3", "market_totals", "Total", show=False),
+        Binding("1", "market('h2h')", "Moneyline", show=False),
+        Binding("2", "market('spreads')", "Spread", show=False),
+        Binding("3", "market('totals')", "Total", show=False),
         Binding("f", "toggle_filter", "Filter", show=False),
         Binding("a", "toggle_arb", "Arb Panel", show=False),
         Binding("t", "cycle_prop_market", "Prop Market", show=False),
@@ -55,30 +59,49 @@ class OddsTickerApp(App):
         self.settings: Settings = load_settings()
         self.data_service = DataService(self.settings)
         self._current_sport: str = ""
-        self._scores_timer = None
-        self._odds_timer = None
-        self._props_timer = None
+        self._refresh_timer = None
+        # Monotonic deadlines for the next scores / odds / props refresh
+        self._next_scores = 0.0
+        self._next_odds = 0.0
+        self._next_props = 0.0
         self._init_done = False  # True after initial setup completes
         self._view_mode: str = "games"  # "games" or "props"
+        self._sports_prefetch: asyncio.Task[list[Sport]] | None = None
 
     def compose(self) -> ComposeResult:
-        yield SportTabs(self.settings.sports, id="sport-tabs")
-        yield GamesTicker(id="games-ticker")
-        yield PropsTable(id="props-table")
-        yield EVPanel(id="ev-panel")
-        yield ArbPanel(id="arb-panel")
-        yield MiddlesPanel(id="mid-panel")
-        with ScrollableContainer(id="settings-scroll"):
-            yield Static(" ", id="settings-content")
-        yield StatusBar(id="status-bar")
+        # Keep handles to every widget the handlers touch, so refreshes and
+        # key presses don't re-run a DOM query each time
+        self._tabs = SportTabs(self.settings.sports, id="sport-tabs")
+        self._ticker = GamesTicker(id="games-ticker")
+        self._props_table = PropsTable(id="props-table")
+        self._ev_panel = EVPanel(id="ev-panel")
+        self._arb_panel = ArbPanel(id="arb-panel")
+        self._mid_panel = MiddlesPanel(id="mid-panel")
+        self._settings_scroll = ScrollableContainer(id="settings-scroll")
+        self._settings_content = Static(" ", id="settings-content")
+        self._status = StatusBar(id="status-bar")
+
+        yield self._tabs
+        yield self._ticker
+        yield self._props_table
+        yield self._ev_panel
+        yield self._arb_panel
+        yield self._mid_panel
+        with self._settings_scroll:
+            yield self._settings_content
+        yield self._status
+
+    async def on_load(self) -> None:
+        # Fire the (free) sports request before the terminal and widgets
+        # are set up, so the round trip overlaps startup work.
+        if self.settings.api_key:
+            self._sports_prefetch = asyncio.create_task(self.data_service.fetch_sports())
 
     async def on_mount(self) -> None:
         if not self.settings.api_key:
-            status = self.query_one("#status-bar", StatusBar)
-            status.set_warning("No API key! Add ODDS_API_KEY to .env")
-            ticker = self.query_one("#games-ticker", GamesTicker)
+            self._status.set_warning("No API key! Add ODDS_API_KEY to .env")
             try:
-                content = ticker.query_one("#games-content", Static)
+                content = self._ticker.query_one("#games-content", Static)
                 content.update(
                     "[bold red]No API key configured.[/bold red]\n"
                     "Add your key to .env: ODDS_API_KEY=your_key_here\n"
@@ -89,15 +112,13 @@ class OddsTickerApp(App):
             return
 
         # Configure display books and DFS overrides for both tickers
-        ticker = self.query_one("#games-ticker", GamesTicker)
-        ticker.set_display_books(self.settings.bookmakers)
-        ticker.set_dfs_books(self.settings.dfs_books)
+        self._ticker.set_display_books(self.settings.bookmakers)
+        self._ticker.set_dfs_books(self.settings.dfs_books)
         # Alt data is fetched when alt_lines_enabled=true, but display
         # starts collapsed — press 'l' to expand alt rows
 
-        props_table = self.query_one("#props-table", PropsTable)
-        props_table.set_display_books(self.settings.bookmakers)
-        props_table.set_dfs_books(self.settings.dfs_books)
+        self._props_table.set_display_books(self.settings.bookmakers)
+        self._props_table.set_dfs_books(self.settings.dfs_books)
 
         # Run full initialization as a worker so it doesn't block
         # the message loop (which would prevent widgets from composing)
@@ -105,14 +126,12 @@ class OddsTickerApp(App):
 
     async def _initialize(self) -> None:
         """Filter sports, load initial data, start timers."""
-        tabs = self.query_one("#sport-tabs", SportTabs)
-
         active_sports = await self._filter_active_sports(self.settings.sports)
         if not active_sports:
             return
 
-        tabs.sports = active_sports
-        tabs._render_tabs()
+        self._tabs.sports = active_sports
+        self._tabs._render_tabs()
 
         self._current_sport = active_sports[0]
         self._init_done = True  # Now safe to accept sport-change events
@@ -120,20 +139,18 @@ class OddsTickerApp(App):
         # Load initial data
         await self._load_data()
 
-        # Start auto-refresh timers
-        self._scores_timer = self.set_interval(
-            self.settings.scores_refresh_interval, self._auto_refresh_scores
-        )
-        self._odds_timer = self.set_interval(
-            self.settings.odds_refresh_interval, self._auto_refresh_odds
-        )
-        self._props_timer = self.set_interval(
-            self.settings.props_refresh_interval, self._auto_refresh_props
-        )
+        # Start auto-refresh: one 1s tick checks all three deadlines rather
+        # than keeping a separate timer per feed
+        now = time.monotonic()
+        self._next_scores = now + self.settings.scores_refresh_interval
+        self._next_odds = now + self.settings.odds_refresh_interval
+        self._next_props = now + self.settings.props_refresh_interval
+        self._refresh_timer = self.set_interval(1.0, self._refresh_tick)
 
     async def _filter_active_sports(self, wanted: list[str]) -> list[str]:
         try:
-            api_sports = await self.data_service.fetch_sports()
+            prefetch, self._sports_prefetch = self._sports_prefetch, None
+            api_sports = await (prefetch or self.data_service.fetch_sports())
             active_keys = {s.key for s in api_sports if s.active}
             return [s for s in wanted if s in active_keys]
         except Exception:
@@ -149,59 +166,45 @@ class OddsTickerApp(App):
         if event.sport_key == self._current_sport:
             return  # Already on this sport
         self._current_sport = event.sport_key
-        if self._view_mode == "props":
-            self.run_worker(self._load_props(), exclusive=True, group="load")
-        else:
-            self.run_worker(self._load_data(), exclusive=True, group="load")
+        self._reload_view()
 
-    def action_next_sport(self) -> None:
-        self.query_one("#sport-tabs", SportTabs).next_sport()
-
-    def action_prev_sport(self) -> None:
-        self.query_one("#sport-tabs", SportTabs).prev_sport()
+    def action_nav(self, step: int) -> None:
+        """Move to the next (step > 0) or previous sport tab."""
+        if step > 0:
+            self._tabs.next_sport()
+        else:
+            self._tabs.prev_sport()
 
     def action_refresh(self) -> None:
         if self._current_sport:
             self.data_service.force_refresh(self._current_sport)
-            status = self.query_one("#status-bar", StatusBar)
-            status.set_refreshing(True)
-            if self._view_mode == "props":
-                self.run_worker(self._load_props(), exclusive=True, group="load")
-            else:
-                self.run_worker(self._load_data(), exclusive=True, group="load")
+            self._status.set_refreshing(True)
+            self._reload_view()
 
     def action_cycle_prop_market(self) -> None:
         if self._view_mode == "props":
-            self.query_one("#props-table", PropsTable).cycle_filter()
+            self._props_table.cycle_filter()
 
-    def action_market_h2h(self) -> None:
+    def action_market(self, market: str) -> None:
         if self._view_mode == "games":
-            self.query_one("#games-ticker", GamesTicker).set_market("h2h")
-
-    def action_market_spreads(self) -> None:
-        if self._view_mode == "games":
-            self.query_one("#games-ticker", GamesTicker).set_market("spreads")
-
-    def action_market_totals(self) -> None:
-        if self._view_mode == "games":
-            self.query_one("#games-ticker", GamesTicker).set_market("totals")
+            self._ticker.set_market(market)
 
     def action_toggle_filter(self) -> None:
         if self._view_mode == "games":
-            self.query_one("#games-ticker", GamesTicker).cycle_filter()
+            self._ticker.cycle_filter()
 
     def action_toggle_ev(self) -> None:
-        self.query_one("#ev-panel", EVPanel).toggle()
+        self._ev_panel.toggle()
 
     def action_toggle_arb(self) -> None:
-        self.query_one("#arb-panel", ArbPanel).toggle()
+        self._arb_panel.toggle()
 
     def action_toggle_middles(self) -> None:
-        self.query_one("#mid-panel", MiddlesPanel).toggle()
+        self._mid_panel.toggle()
 
     def action_toggle_search(self) -> None:
         if self._view_mode == "props":
-            self.query_one("#props-table", PropsTable).toggle_search()
+            self._props_table.toggle_search()
 
     def action_toggle_alt_lines(self) -> None:
         """Toggle alternate lines display on/off.
@@ -210,36 +213,28 @@ class OddsTickerApp(App):
         This toggle only controls whether alt rows are expanded in the display.
         If alt data hasn't been fetched yet, triggers a refresh to get it.
         """
-        ticker = self.query_one("#games-ticker", GamesTicker)
+        ticker = self._ticker
         new_state = not ticker._alt_lines
         ticker.set_alt_lines(new_state)
         state = "ON" if new_state else "OFF"
-        status = self.query_one("#status-bar", StatusBar)
-        status.set_warning(f"Alt Lines: {state}")
+        self._status.set_warning(f"Alt Lines: {state}")
 
         if new_state and self._current_sport:
             # Turning on — may need to fetch alt data if not cached
             self.data_service.force_refresh(self._current_sport)
-            if self._view_mode == "props":
-                self.run_worker(self._load_props(), exclusive=True, group="load")
-            else:
-                self.run_worker(self._load_data(), exclusive=True, group="load")
+            self._reload_view()
         elif self._last_games_for_redraw():
             # Turning off — just re-render with existing data (no fetch needed)
             ticker.update_games(ticker._last_games)
 
     def _last_games_for_redraw(self) -> bool:
         """Check if ticker has cached games for a display-only redraw."""
-        try:
-            ticker = self.query_one("#games-ticker", GamesTicker)
-            return ticker._last_games is not None
-        except Exception:
-            return False
+        return self._ticker._last_games is not None
 
     def action_toggle_props(self) -> None:
         """Switch between games view and props view."""
-        ticker = self.query_one("#games-ticker", GamesTicker)
-        props = self.query_one("#props-table", PropsTable)
+        ticker = self._ticker
+        props = self._props_table
 
         if self._view_mode == "games":
             self._view_mode = "props"
@@ -258,21 +253,23 @@ class OddsTickerApp(App):
                 self.run_worker(self._load_data(), exclusive=True, group="load")
 
     def action_toggle_settings(self) -> None:
-        scroll = self.query_one("#settings-scroll", ScrollableContainer)
+        scroll = self._settings_scroll
         if scroll.has_class("visible"):
             scroll.remove_class("visible")
         else:
             scroll.add_class("visible")
-            self._render_settings_panel()
+            self._settings_content.update(self._settings_text)
 
-    def _render_settings_panel(self) -> None:
+    @functools.cached_property
+    def _settings_text(self) -> str:
+        """Settings panel markup; settings are loaded once, so it's built once."""
         s = self.settings
-        text = (
+        return (
             "[bold]Settings[/bold] (edit settings.yaml)\n\n"
-            f"[bold]Regions:[/bold] {', '.join(s.regions)}\n"
+            f"[bold]Regions:[/bold] {s.regions_display}\n"
             f"[bold]Bookmakers:[/bold] ({len(s.bookmakers)})\n"
-            + "\n".join(f"  - {b}" for b in s.bookmakers)
-            + f"\n\n[bold]EV Reference:[/bold] {s.ev_reference}"
+            f"{s.bookmakers_bulleted}"
+            f"\n\n[bold]EV Reference:[/bold] {s.ev_reference}"
             f"\n[bold]EV Threshold:[/bold] {s.ev_threshold}%"
             f"\n[bold]EV Odds Range:[/bold] {s.ev_odds_min:+.0f} to {s.ev_odds_max:+.0f}"
             f"\n[bold]Odds Format:[/bold] {s.odds_format}"
@@ -285,7 +282,6 @@ class OddsTickerApp(App):
             f"\n  Arb Detection: {'ON' if s.arb_enabled else 'OFF'}"
             f"\n  Middle Detection: {'ON' if s.middle_enabled else 'OFF'}"
         )
-        self.query_one("#settings-content", Static).update(text)
 
     async def _load_data(self) -> None:
         if not self._current_sport:
@@ -294,29 +290,29 @@ class OddsTickerApp(App):
         sport = self._current_sport
         log.info("Loading data for %s", sport)
 
-        ticker = self.query_one("#games-ticker", GamesTicker)
-        status = self.query_one("#status-bar", StatusBar)
-        ev_panel = self.query_one("#ev-panel", EVPanel)
-        arb_panel = self.query_one("#arb-panel", ArbPanel)
-        mid_panel = self.query_one("#mid-panel", MiddlesPanel)
+        ticker = self._ticker
+        status = self._status
+        ev_panel = self._ev_panel
+        arb_panel = self._arb_panel
+        mid_panel = self._mid_panel
 
         ticker.set_loading(True)
 
         try:
+            # Game rows first: with alt lines on, this merges alt markets into
+            # the cached events the scans below read
             games = await self.data_service.get_game_rows(sport)
             log.info("Got %d games for %s", len(games), sport)
-
-            ev_bets = await self.data_service.get_ev_bets(sport)
-
             ticker.update_games(games)
 
+            # EV, arb + middles detection all read the same cached events
+            ev_bets, arbs, middles = await asyncio.gather(
+                self.data_service.get_ev_bets(sport),
+                self.data_service.get_arb_bets(sport),
+                self.data_service.get_middle_bets(sport),
+            )
             ev_panel.update_bets(ev_bets)
-
-            # Arb + middles detection
-            arbs = await self.data_service.get_arb_bets(sport)
             arb_panel.update_arbs(arbs)
-
-            middles = await self.data_service.get_middle_bets(sport)
             mid_panel.update_middles(middles)
 
             status.update_credits(self.data_service.budget)
@@ -339,11 +335,11 @@ class OddsTickerApp(App):
         sport = self._current_sport
         log.info("Loading props for %s", sport)
 
-        props_table = self.query_one("#props-table", PropsTable)
-        status = self.query_one("#status-bar", StatusBar)
-        ev_panel = self.query_one("#ev-panel", EVPanel)
-        arb_panel = self.query_one("#arb-panel", ArbPanel)
-        mid_panel = self.query_one("#mid-panel", MiddlesPanel)
+        props_table = self._props_table
+        status = self._status
+        ev_panel = self._ev_panel
+        arb_panel = self._arb_panel
+        mid_panel = self._mid_panel
 
         props_table.set_loading(True)
 
@@ -356,17 +352,16 @@ class OddsTickerApp(App):
             prop_rows = self.data_service.get_prop_rows(events)
             log.info("Got %d prop rows for %s", len(prop_rows), sport)
 
-            prop_ev_bets = await self.data_service.get_prop_ev_bets(sport)
-
             props_table.update_props(prop_rows)
 
+            # Prop EV, arb + middles detection over the props just fetched
+            prop_ev_bets, prop_arbs, prop_middles = await asyncio.gather(
+                self.data_service.get_prop_ev_bets(sport),
+                self.data_service.get_prop_arb_bets(sport),
+                self.data_service.get_prop_middle_bets(sport),
+            )
             ev_panel.update_bets(prop_ev_bets)
-
-            # Prop arb + middles detection
-            prop_arbs = await self.data_service.get_prop_arb_bets(sport)
             arb_panel.update_arbs(prop_arbs)
-
-            prop_middles = await self.data_service.get_prop_middle_bets(sport)
             mid_panel.update_middles(prop_middles)
 
             status.update_credits(self.data_service.budget)
@@ -381,17 +376,36 @@ class OddsTickerApp(App):
             except Exception:
                 pass
 
-    async def _auto_refresh_scores(self) -> None:
-        if self._current_sport and self._view_mode == "games":
-            self.data_service.cache.invalidate(f"{self._current_sport}:scores")
-            self.run_worker(self._load_data(), exclusive=True, group="load")
+    async def _refresh_tick(self) -> None:
+        """Expire whichever feeds are due, then reload the view once.
 
-    async def _auto_refresh_odds(self) -> None:
-        if self._current_sport and self._view_mode == "games":
-            self.data_service.cache.invalidate(f"{self._current_sport}:odds")
-            self.run_worker(self._load_data(), exclusive=True, group="load")
+        Scores and odds often come due on the same tick; both feed the games
+        view, so they share one load instead of starting two.
+        """
+        now = time.monotonic()
+        reload = False
+        if now >= self._next_scores:
+            self._next_scores = now + self.settings.scores_refresh_interval
+            reload |= self._expire_feed("scores", "games")
+        if now >= self._next_odds:
+            self._next_odds = now + self.settings.odds_refresh_interval
+            reload |= self._expire_feed("odds", "games")
+        if now >= self._next_props:
+            self._next_props = now + self.settings.props_refresh_interval
+            reload |= self._expire_feed("props", "props")
+        if reload:
+            self._reload_view()
+
+    def _expire_feed(self, feed: str, view: str) -> bool:
+        """Invalidate the current sport's ``feed`` if it backs the visible view."""
+        if not self._current_sport or self._view_mode != view:
+            return False
+        self.data_service.cache.invalidate(f"{self._current_sport}:{feed}")
+        return True
 
-    async def _auto_refresh_props(self) -> None:
-        if self._current_sport and self._view_mode == "props":
-            self.data_service.cache.invalidate(f"{self._current_sport}:props")
+    def _reload_view(self) -> None:
+        """Reload whichever view (games or props) is showing."""
+        if self._view_mode == "props":
             self.run_worker(self._load_props(), exclusive=True, group="load")
+        else:
+            self.run_worker(self._load_data(), exclusive=True, group="load")
@@ -12,7 +12,7 @@ from textual.containers import ScrollableContainer, Vertical
 from textual.widgets import Static
 
 from app.api.models import Bookmaker, GameRow
-from app.services.ev import compute_inline_ev
+from app.services.ev import compute_inline_ev_pair
 from app.ui.widgets.constants import BOOK_SHORT, MAX_DISPLAY_BOOKS, trunc
 
 MARKET_LABELS = {"h2h": "MONEYLINE", "spreads": "SPREAD", "totals": "TOTAL"}
@@ -212,8 +212,7 @@ def _build_alt_spread_row(
     # NOVIG + EV%
     a_prices = _all_prices(game, a_outcome, market_key, a_point, dfs_books)
     h_prices = _all_prices(game, h_outcome, market_key, h_point, dfs_books)
-    a_novig, a_ev = compute_inline_ev(a_prices, h_prices)
-    h_novig, h_ev = compute_inline_ev(h_prices, a_prices)
+    a_novig, a_ev, h_novig, h_ev = compute_inline_ev_pair(a_prices, h_prices)
 
     if a_novig is not None:
         away_line.append(_odds(a_novig).center(7), style="white")
@@ -302,8 +301,7 @@ def _build_alt_total_row(
     # NOVIG + EV%
     a_prices = _all_prices(game, "Over", market_key, total_point, dfs_books)
     h_prices = _all_prices(game, "Under", market_key, total_point, dfs_books)
-    a_novig, a_ev = compute_inline_ev(a_prices, h_prices)
-    h_novig, h_ev = compute_inline_ev(h_prices, a_prices)
+    a_novig, a_ev, h_novig, h_ev = compute_inline_ev_pair(a_prices, h_prices)
 
     if a_novig is not None:
         away_line.append(_odds(a_novig).center(7), style="white")
@@ -517,8 +515,7 @@ def _build_game_lines(
     a_prices = _all_prices(game, a_outcome, market, a_point, dfs_books)
     h_prices = _all_prices(game, h_outcome, market, h_point, dfs_books)
 
-    a_novig, a_ev = compute_inline_ev(a_prices, h_prices)
-    h_novig, h_ev = compute_inline_ev(h_prices, a_prices)
+    a_novig, a_ev, h_novig, h_ev = compute_inline_ev_pair(a_prices, h_prices)
 
     # NOVIG
     if a_novig is not None:
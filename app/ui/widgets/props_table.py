@@ -12,7 +12,7 @@ from textual.containers import ScrollableContainer, Vertical
 from textual.widgets import Input, Static
 
 from app.api.models import PropRow
-from app.services.ev import compute_inline_ev
+from app.services.ev import compute_inline_ev_pair
 from app.ui.widgets.constants import BOOK_SHORT, MAX_DISPLAY_BOOKS, PROP_LABELS, trunc
 
 
@@ -101,18 +101,23 @@ def _build_game_separator(away: str, home: str, commence_time=None) -> Text:
     return t
 
 
+InlineEV = tuple[float | None, float | None, float | None, float | None]
+
+
+def _inline_ev(row: PropRow) -> InlineEV:
+    """(over no-vig, over EV%, under no-vig, under EV%) for a paired row."""
+    return compute_inline_ev_pair(
+        list(row.over_odds.values()), list(row.under_odds.values()),
+    )
+
+
 def _build_prop_pair(
     row: PropRow, display_books: list[str],
     dfs_books: dict[str, float] | None = None,
+    inline_ev: InlineEV | None = None,
 ) -> list[Text]:
     """Build two lines (Over + Under) for a paired PropRow."""
-    over_prices = list(row.over_odds.values())
-    under_prices = list(row.under_odds.values())
-
-    # Compute inline EV for Over side
-    ov_novig, ov_ev = compute_inline_ev(over_prices, under_prices)
-    # Compute inline EV for Under side
-    un_novig, un_ev = compute_inline_ev(under_prices, over_prices)
+    ov_novig, ov_ev, un_novig, un_ev = inline_ev or _inline_ev(row)
 
     ov_best, ov_best_bk = _best_with_book(row.over_odds)
     un_best, un_best_bk = _best_with_book(row.under_odds)
@@ -213,16 +218,13 @@ def _build_sticky_header(
     )
 
 
-def _precompute_ev(rows: list[PropRow]) -> dict[int, float]:
-    """Pre-compute best EV for each row (by id) to avoid redundant calls."""
-    ev_cache: dict[int, float] = {}
-    for row in rows:
-        over_prices = list(row.over_odds.values())
-        under_prices = list(row.under_odds.values())
-        _, ov_ev = compute_inline_ev(over_prices, under_prices)
-        _, un_ev = compute_inline_ev(under_prices, over_prices)
-        ev_cache[id(row)] = max(ov_ev or -999, un_ev or -999)
-    return ev_cache
+def _precompute_ev(rows: list[PropRow]) -> dict[int, InlineEV]:
+    """Pre-compute inline EV for each row (by id) for both sorting and rendering."""
+    return {id(row): _inline_ev(row) for row in rows}
+
+
+def _best_ev(inline_ev: InlineEV) -> float:
+    return max(inline_ev[1] or -999, inline_ev[3] or -999)
 
 
 def _build_rows(
@@ -241,7 +243,7 @@ def _build_rows(
     # Pre-compute EV once, then sort using cached values
     ev_cache = _precompute_ev(rows)
     rows = sorted(rows, key=lambda r: (
-        r.commence_time, r.event_id, -ev_cache.get(id(r), -999), r.player_name,
+        r.commence_time, r.event_id, -_best_ev(ev_cache[id(r)]), r.player_name,
     ))
 
     elements: list = []
@@ -257,7 +259,7 @@ def _build_rows(
         ))
         elements.append(Rule(style="#222222"))
         for row in game_rows:
-            pair = _build_prop_pair(row, display_books, dfs_books)
+            pair = _build_prop_pair(row, display_books, dfs_books, ev_cache[id(row)])
             elements.extend(pair)
             elements.append(Rule(style="#1a1a1a"))
 
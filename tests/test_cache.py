@@ -1,7 +1,10 @@
 """Tests for TTLCache."""
 
+import asyncio
 import time
 
+import pytest
+
 from app.services.cache import TTLCache
 
 
@@ -58,3 +61,140 @@ def test_overwrite():
     cache.set("k1", "old", ttl=60)
     cache.set("k1", "new", ttl=60)
     assert cache.get("k1") == "new"
+
+
+def test_set_sweeps_expired_entries(monkeypatch):
+    cache = TTLCache()
+    base = time.monotonic()
+    monkeypatch.setattr(time, "monotonic", lambda: base)
+    cache.set("old", 1, ttl=10)
+    cache.set("keep", 2, ttl=100)
+    assert len(cache) == 2
+
+    monkeypatch.setattr(time, "monotonic", lambda: base + 11)
+    assert "old" not in cache
+    assert "keep" in cache
+    cache.set("new", 3, ttl=10)
+    assert "old" not in cache._store
+    assert len(cache) == 2
+
+
+def test_max_entries_evicts_least_recently_used():
+    cache = TTLCache(max_entries=2)
+    cache.set("a", 1, ttl=60)
+    cache.set("b", 2, ttl=60)
+    assert cache.get("a") == 1  # "b" is now the oldest
+    cache.set("c", 3, ttl=60)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert len(cache) == 2
+
+
+def test_replace_only_swaps_the_expected_value():
+    cache = TTLCache()
+    old, new = ["old"], ["new"]
+    cache.set("k", old, ttl=60)
+    assert cache.replace("k", ["other"], new) is False
+    assert cache.get("k") is old
+    assert cache.replace("k", old, new) is True
+    assert cache.get("k") is new
+    assert cache.replace("missing", None, new) is False
+
+
+async def test_get_or_fetch_coalesces_concurrent_misses():
+    cache = TTLCache()
+    calls = 0
+
+    async def fetch():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return ["odds"]
+
+    results = await asyncio.gather(*[cache.get_or_fetch("k", fetch, ttl=60) for _ in range(5)])
+
+    assert calls == 1
+    assert results == [["odds"]] * 5
+    assert cache.get("k") == ["odds"]
+    assert await cache.get_or_fetch("k", fetch, ttl=60) == ["odds"]
+    assert calls == 1
+
+
+async def test_get_or_fetch_does_not_cache_none_or_errors():
+    cache = TTLCache()
+
+    async def empty():
+        return None
+
+    async def boom():
+        raise RuntimeError("api down")
+
+    assert await cache.get_or_fetch("k", empty, ttl=60) is None
+    assert "k" not in cache
+    with pytest.raises(RuntimeError):
+        await cache.get_or_fetch("k", boom, ttl=60)
+    assert "k" not in cache
+    assert cache._inflight == {}
+
+
+async def test_invalidate_cancels_inflight_fetch_and_waiters_refetch():
+    cache = TTLCache()
+    versions = iter(["stale", "fresh"])
+    started = asyncio.Event()
+
+    async def fetch():
+        value = next(versions)
+        started.set()
+        await asyncio.sleep(0.01)
+        return value
+
+    waiter = asyncio.ensure_future(cache.get_or_fetch("k", fetch, ttl=60))
+    await started.wait()
+    cache.invalidate("k")
+
+    assert await waiter == "fresh"
+    assert cache.get("k") == "fresh"
+    assert cache._inflight == {}
+
+
+def test_persisted_entries_survive_restart(tmp_path):
+    path = tmp_path / "cache.db"
+    cache = TTLCache(persist_path=path)
+    cache.set("basketball_nba:odds", [{"id": "e1"}], ttl=60)
+    cache.set("gone", "x", ttl=60)
+    cache.invalidate("gone")
+    cache.close()
+
+    reopened = TTLCache(persist_path=path)
+    # Loaded into memory up front, not on the first miss
+    assert len(reopened) == 1
+    assert reopened.get("basketball_nba:odds") == [{"id": "e1"}]
+    assert reopened.get("gone") is None
+    reopened.close()
+
+
+def test_persisted_entries_expire_by_wall_clock(tmp_path, monkeypatch):
+    path = tmp_path / "cache.db"
+    cache = TTLCache(persist_path=path)
+    cache.set("k", "v", ttl=10)
+    cache.close()
+
+    now = time.time()
+    monkeypatch.setattr(time, "time", lambda: now + 11)
+    reopened = TTLCache(persist_path=path)
+    assert reopened.get("k") is None
+    reopened.close()
+
+
+def test_persisted_value_is_snapshot_at_set_time(tmp_path):
+    path = tmp_path / "cache.db"
+    cache = TTLCache(persist_path=path)
+    value = [{"id": "e1"}]
+    cache.set("k", value, ttl=60)
+    value.append({"id": "e2"})
+    cache.close()
+
+    reopened = TTLCache(persist_path=path)
+    assert reopened.get("k") == [{"id": "e1"}]
+    reopened.close()
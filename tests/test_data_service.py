@@ -2,10 +2,12 @@
 
 from __future__ import annotations
 
+import asyncio
 from unittest.mock import AsyncMock, patch
 
 import pytest
 
+from app.api.models import Sport
 from app.config import Settings
 from app.services.budget import BudgetTracker
 from app.services.cache import TTLCache
@@ -103,3 +105,101 @@ async def test_force_refresh_invalidates_cache(data_service):
     assert data_service.cache.get("basketball_nba:scores") is None
     assert data_service.cache.get("basketball_nba:odds") is None
     assert data_service.cache.get("basketball_nba:props") is None
+
+
+async def test_fetch_props_uses_event_ids(data_service, sample_prop_event):
+    with patch("app.services.data_service.get_events", new_callable=AsyncMock) as mock_events, \
+         patch("app.services.data_service.get_props_for_events", new_callable=AsyncMock) as mock_props:
+        mock_events.return_value = [sample_prop_event]
+        mock_props.return_value = [sample_prop_event]
+
+        events = await data_service.fetch_props("basketball_nba")
+
+        assert events == [sample_prop_event]
+        assert mock_props.await_args.args[2] == [sample_prop_event.id]
+
+
+def _alt_event(event):
+    alt = event.model_copy(deep=True)
+    for bm in alt.bookmakers:
+        for m in bm.markets:
+            m.key = f"alternate_{m.key}"
+    return alt
+
+
+async def test_concurrent_alt_fetches_share_one_request(settings, mock_client, sample_event):
+    settings.alt_lines_enabled = True
+    ds = DataService(
+        settings=settings, client=mock_client, cache=TTLCache(),
+        budget=BudgetTracker(), ev_store=EVStore(db_path=":memory:"),
+    )
+
+    async def slow_event_odds(*args, **kwargs):
+        await asyncio.sleep(0.01)
+        return _alt_event(sample_event)
+
+    with patch("app.services.data_service.get_event_odds", side_effect=slow_event_odds) as mock_eo:
+        a, b = await asyncio.gather(
+            ds.fetch_alt_lines("basketball_nba", [sample_event.model_copy(deep=True)]),
+            ds.fetch_alt_lines("basketball_nba", [sample_event.model_copy(deep=True)]),
+        )
+
+    assert mock_eo.call_count == 1
+    assert ds._alt_inflight == {}
+    base_markets = len(sample_event.bookmakers[0].markets)
+    assert len(a[0].bookmakers[0].markets) == 2 * base_markets
+    assert len(b[0].bookmakers[0].markets) == 2 * base_markets
+
+
+async def test_alt_merge_is_idempotent_on_cache_hits(settings, mock_client, sample_event):
+    settings.alt_lines_enabled = True
+    ds = DataService(
+        settings=settings, client=mock_client, cache=TTLCache(),
+        budget=BudgetTracker(), ev_store=EVStore(db_path=":memory:"),
+    )
+    events = [sample_event.model_copy(deep=True)]
+
+    with patch("app.services.data_service.get_event_odds", new_callable=AsyncMock) as mock_eo:
+        mock_eo.return_value = _alt_event(sample_event)
+        for _ in range(3):
+            events = await ds.fetch_alt_lines("basketball_nba", events)
+
+    assert mock_eo.await_count == 1
+    keys = [m.key for m in events[0].bookmakers[0].markets]
+    assert len(keys) == len(set(keys)) == 2 * len(sample_event.bookmakers[0].markets)
+
+
+async def test_expired_sports_served_stale_while_refreshing(data_service):
+    old = [Sport(key="basketball_nba", group="Basketball", title="NBA")]
+    new = [*old, Sport(key="icehockey_nhl", group="Ice Hockey", title="NHL")]
+    data_service.cache.set("sports:stale", old, ttl=600)  # hourly entry expired
+
+    with patch("app.services.data_service.get_sports", new_callable=AsyncMock) as mock_sports:
+        mock_sports.return_value = new
+        assert await data_service.fetch_sports() == old
+        await data_service._sports_refresh
+
+        assert mock_sports.await_count == 1
+        assert await data_service.fetch_sports() == new
+        assert mock_sports.await_count == 1
+
+
+async def test_alt_merge_copies_and_swaps_cached_odds(settings, mock_client, sample_event):
+    settings.alt_lines_enabled = True
+    ds = DataService(
+        settings=settings, client=mock_client, cache=TTLCache(),
+        budget=BudgetTracker(), ev_store=EVStore(db_path=":memory:"),
+    )
+    events = [sample_event.model_copy(deep=True)]
+    base_markets = len(events[0].bookmakers[0].markets)
+    ds.cache.set("basketball_nba:odds", events, ttl=60)
+
+    with patch("app.services.data_service.get_event_odds", new_callable=AsyncMock) as mock_eo:
+        mock_eo.return_value = _alt_event(sample_event)
+        merged = await ds.fetch_alt_lines("basketball_nba", events)
+
+    # Scans holding the old list never see it change under them
+    assert len(events[0].bookmakers[0].markets) == base_markets
+    assert len(merged[0].bookmakers[0].markets) == 2 * base_markets
+    assert "alternate_h2h" in merged[0].market_index
+    assert ds.cache.get("basketball_nba:odds") is merged
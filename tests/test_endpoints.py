@@ -0,0 +1,225 @@
+"""Tests for API client + endpoints using an httpx mock transport."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+
+import httpx
+
+from app.api.client import OddsAPIClient, TokenBucket
+from app.api.endpoints import get_odds, get_props_for_events, get_sports
+from app.api.models import Event, Sport
+
+
+def _client(handler) -> OddsAPIClient:
+    return OddsAPIClient("test_key", transport=httpx.MockTransport(handler))
+
+
+async def test_get_sports_validates_raw_bytes():
+    payload = [
+        {"key": "basketball_nba", "group": "Basketball", "title": "NBA", "active": True},
+        {"key": "icehockey_nhl", "group": "Ice Hockey", "title": "NHL", "active": False},
+    ]
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        assert request.url.params["apiKey"] == "test_key"
+        return httpx.Response(
+            200,
+            content=json.dumps(payload).encode(),
+            headers={"x-requests-remaining": "480", "x-requests-used": "20"},
+        )
+
+    client = _client(handler)
+    sports = await get_sports(client)
+    await client.close()
+
+    assert [s.key for s in sports] == ["basketball_nba", "icehockey_nhl"]
+    assert all(isinstance(s, Sport) for s in sports)
+    assert sports[1].active is False
+    assert client.last_credit_info.remaining == 480
+    assert client.last_credit_info.used == 20
+
+
+async def test_not_modified_reuses_previous_body():
+    payload = [{"key": "basketball_nba", "group": "Basketball", "title": "NBA"}]
+    seen_headers: list[httpx.Headers] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen_headers.append(request.headers)
+        if request.headers.get("if-none-match") == '"v1"':
+            return httpx.Response(304, headers={"etag": '"v1"'})
+        return httpx.Response(
+            200, content=json.dumps(payload).encode(), headers={"etag": '"v1"'},
+        )
+
+    client = _client(handler)
+    first = await get_sports(client)
+    second = await get_sports(client)
+    await client.close()
+
+    assert len(seen_headers) == 2
+    assert "if-none-match" not in seen_headers[0]
+    assert seen_headers[1]["if-none-match"] == '"v1"'
+    assert [s.key for s in second] == [s.key for s in first] == ["basketball_nba"]
+
+
+async def test_paid_endpoints_not_kept_for_revalidation():
+    seen_headers: list[httpx.Headers] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen_headers.append(request.headers)
+        return httpx.Response(
+            200, content=b"[]",
+            headers={"etag": '"v1"', "cache-control": "max-age=60"},
+        )
+
+    client = _client(handler)
+    await get_odds(client, "basketball_nba")
+    await get_odds(client, "basketball_nba")
+    await client.close()
+
+    assert len(seen_headers) == 2
+    assert "if-none-match" not in seen_headers[1]
+
+
+async def test_max_age_serves_without_request():
+    calls = 0
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        nonlocal calls
+        calls += 1
+        return httpx.Response(
+            200, content=b"[]", headers={"cache-control": "public, max-age=60"},
+        )
+
+    client = _client(handler)
+    assert await get_sports(client) == []
+    assert await get_sports(client) == []
+    await client.close()
+    assert calls == 1
+
+
+async def test_caller_params_not_mutated():
+    def handler(request: httpx.Request) -> httpx.Response:
+        assert request.url.params["apiKey"] == "test_key"
+        assert request.url.params["daysFrom"] == "1"
+        return httpx.Response(200, content=b"[]")
+
+    client = _client(handler)
+    params = {"daysFrom": 1}
+    await client.get_raw("/sports/basketball_nba/scores", params)
+    await client.close()
+    assert params == {"daysFrom": 1}
+
+
+async def test_props_fan_out_bounded_and_ordered():
+    in_flight = 0
+    peak = 0
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0)
+        in_flight -= 1
+        eid = request.url.path.split("/")[-2]
+        if eid == "bad":
+            return httpx.Response(500)
+        body = {
+            "id": eid, "sport_key": "basketball_nba",
+            "commence_time": "2026-03-01T19:00:00Z",
+            "home_team": "Lakers", "away_team": "Celtics",
+        }
+        return httpx.Response(200, content=json.dumps(body).encode())
+
+    client = _client(handler)
+    events = await get_props_for_events(
+        client, "basketball_nba", ["e1", "bad", "e2", "e3", "e4"], max_concurrent=2,
+    )
+    await client.close()
+
+    assert [e.id for e in events] == ["e1", "e2", "e3", "e4"]
+    assert peak <= 2
+
+
+async def test_unchanged_sports_body_skips_revalidation():
+    payload = [{"key": "basketball_nba", "group": "Basketball", "title": "NBA"}]
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, content=json.dumps(payload).encode())
+
+    client = _client(handler)
+    first = await get_sports(client)
+    second = await get_sports(client)
+    await client.close()
+
+    assert first is not second
+    assert first[0] is second[0]
+
+
+async def test_get_odds_validates_nested_event_tree():
+    payload = [{
+        "id": "e1", "sport_key": "basketball_nba",
+        "commence_time": "2026-03-01T19:00:00Z",
+        "home_team": "Lakers", "away_team": "Celtics",
+        "bookmakers": [{
+            "key": "fanduel", "title": "FanDuel",
+            "markets": [{
+                "key": "h2h",
+                "outcomes": [
+                    {"name": "Lakers", "price": -110},
+                    {"name": "Celtics", "price": "-105"},
+                ],
+            }],
+        }],
+    }]
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        assert request.url.params["bookmakers"] == "fanduel,draftkings"
+        return httpx.Response(200, content=json.dumps(payload).encode())
+
+    client = _client(handler)
+    events = await get_odds(client, "basketball_nba", bookmakers="fanduel,draftkings")
+    await client.close()
+
+    assert isinstance(events[0], Event)
+    outcomes = events[0].bookmakers[0].markets[0].outcomes
+    assert [o.price for o in outcomes] == [-110.0, -105.0]
+
+
+async def test_token_bucket_waits_when_empty(monkeypatch):
+    sleeps: list[float] = []
+
+    async def fake_sleep(delay: float) -> None:
+        sleeps.append(delay)
+
+    monkeypatch.setattr(asyncio, "sleep", fake_sleep)
+    bucket = TokenBucket(per_minute=2)
+    await bucket.acquire()
+    await bucket.acquire()
+    assert sleeps == []
+
+    await bucket.acquire()
+    assert len(sleeps) == 1
+    assert 0 < sleeps[0] <= 30.0
+
+
+async def test_credit_info_updated_in_place():
+    remaining = iter(["1", "0", "oops"])
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(
+            200, content=b"[]", headers={"x-requests-remaining": next(remaining)},
+        )
+
+    client = _client(handler)
+    info = client.last_credit_info
+    await get_sports(client)
+    assert info.remaining == 1
+    await get_sports(client)
+    assert info.remaining == 0  # zero credits must not read as "unknown"
+    await get_sports(client)
+    await client.close()
+    assert info.remaining is None
+    assert client.last_credit_info is info
@@ -10,6 +10,7 @@ from app.services.ev import (
     american_to_decimal,
     american_to_implied_prob,
     compute_inline_ev,
+    compute_inline_ev_pair,
     find_ev_bets,
     prob_to_american,
     remove_vig,
@@ -50,6 +51,13 @@ class TestAmericanToImpliedProb:
         """Zero American odds should return 0.0 probability, not crash."""
         assert american_to_implied_prob(0) == 0.0
 
+    def test_table_matches_formula(self):
+        """Whole-number prices come from the lookup table, others are computed."""
+        assert american_to_implied_prob(-110.0) == 110 / 210
+        assert american_to_implied_prob(150) == 100 / 250
+        assert american_to_implied_prob(-110.5) == 110.5 / 210.5
+        assert american_to_implied_prob(-5000) == 5000 / 5100
+
 
 class TestProbToAmerican:
     def test_favorite(self):
@@ -111,6 +119,14 @@ class TestComputeInlineEv:
         # Best price (150) should have positive EV against the no-vig line
         assert ev is not None
 
+    def test_pair_matches_both_directions(self):
+        over = [-110, -105, -115, 100]
+        under = [-110, -115, -105, -120]
+        assert compute_inline_ev_pair(over, under) == (
+            *compute_inline_ev(over, under), *compute_inline_ev(under, over),
+        )
+        assert compute_inline_ev_pair(over, under[:2]) == (None, None, None, None)
+
 
 class TestFindEvBets:
     def test_returns_list(self, sample_event: Event):
@@ -123,6 +139,12 @@ class TestFindEvBets:
             for i in range(len(bets) - 1):
                 assert bets[i].ev_percentage >= bets[i + 1].ev_percentage
 
+    def test_top_n_matches_head_of_full_ranking(self, sample_event: Event):
+        full = find_ev_bets([sample_event], ev_threshold=-100.0)
+        assert len(full) > 2
+        top = find_ev_bets([sample_event], ev_threshold=-100.0, top_n=2)
+        assert [b.ev_percentage for b in top] == [b.ev_percentage for b in full[:2]]
+
     def test_high_threshold_returns_empty(self, sample_event: Event):
         bets = find_ev_bets([sample_event], ev_threshold=50.0)
         assert bets == []
@@ -2,7 +2,9 @@
 
 from __future__ import annotations
 
-from datetime import datetime
+from datetime import datetime, timedelta
+
+import pytest
 
 from app.services.ev import EVBet
 from app.services.ev_store import EVStore
@@ -90,6 +92,57 @@ def test_deactivate_missing_empty_clears_all():
     assert store.get_active_for_sport("basketball_nba") == []
 
 
+def test_sync_sport_upserts_and_deactivates_in_one_commit():
+    store = EVStore(db_path=":memory:")
+    old = _make_bet(book="draftkings")
+    keep = _make_bet(book="fanduel")
+    store.upsert_bets([old, keep])
+
+    statements: list[str] = []
+    store._conn.set_trace_callback(statements.append)
+    store.sync_sport("basketball_nba", [keep, _make_bet(book="betmgm")])
+    store._conn.set_trace_callback(None)
+
+    assert not store._conn.in_transaction
+    assert sum(s.strip().upper() == "COMMIT" for s in statements) == 1
+    rows = store._conn.execute("SELECT book, is_active FROM ev_bets").fetchall()
+    assert {r["book"]: r["is_active"] for r in rows} == {
+        "draftkings": 0, "fanduel": 1, "betmgm": 1,
+    }
+
+
+def test_deactivate_missing_matches_on_point_and_player():
+    store = EVStore(db_path=":memory:")
+    over = _make_bet(
+        market="player_points", outcome_name="Over", outcome_point=25.5,
+        player_name="LeBron James", is_prop=True,
+    )
+    moved = _make_bet(
+        market="player_points", outcome_name="Over", outcome_point=26.5,
+        player_name="LeBron James", is_prop=True,
+    )
+    store.upsert_bets([over, moved])
+
+    store.deactivate_missing("basketball_nba", [over, over], is_props=True)
+    store.deactivate_missing("basketball_nba", [over], is_props=True)
+    active = store.get_active_for_sport("basketball_nba", is_props=True)
+    assert [r["outcome_point_str"] for r in active] == ["25.5"]
+
+
+def test_minutes_active_measured_in_local_time():
+    store = EVStore(db_path=":memory:")
+    store.upsert_bets([_make_bet(detected_at=datetime.now() - timedelta(minutes=90))])
+    [row] = store.get_active_for_sport("basketball_nba")
+    assert row["minutes_active"] == pytest.approx(90.0, abs=0.2)
+
+
+def test_missing_detected_at_falls_back_to_insert_time():
+    store = EVStore(db_path=":memory:")
+    store.upsert_bets([_make_bet(detected_at=None)])
+    [row] = store.get_active_for_sport("basketball_nba")
+    assert row["detected_at"] == row["last_seen_at"]
+
+
 def test_prop_scoping():
     store = EVStore(db_path=":memory:")
     game_bet = _make_bet(is_prop=False)
@@ -128,6 +181,28 @@ def test_mark_stale_for_sport():
     assert active[0]["event_id"] == "e1"
 
 
+def test_get_active_uses_index_for_filter_and_order():
+    store = EVStore(db_path=":memory:")
+    plan = " ".join(r["detail"] for r in store._conn.execute(
+        "EXPLAIN QUERY PLAN SELECT * FROM ev_bets "
+        "WHERE is_active = 1 AND sport_key = ? AND is_prop = ? "
+        "ORDER BY ev_percentage DESC LIMIT ?",
+        ("basketball_nba", 0, 40),
+    ))
+    assert "idx_ev_active" in plan
+    assert "TEMP B-TREE" not in plan
+
+
+def test_mark_stale_uses_partial_active_index():
+    store = EVStore(db_path=":memory:")
+    plan = " ".join(r["detail"] for r in store._conn.execute(
+        "EXPLAIN QUERY PLAN UPDATE ev_bets SET is_active = 0 "
+        "WHERE sport_key = ? AND is_active = 1 AND event_id NOT IN (?)",
+        ("basketball_nba", "e1"),
+    ))
+    assert "idx_ev_active_partial" in plan
+
+
 def test_close():
     store = EVStore(db_path=":memory:")
     store.close()
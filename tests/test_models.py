@@ -4,7 +4,16 @@ from __future__ import annotations
 
 from datetime import datetime, timezone
 
-from app.api.models import GameRow, PropRow, Score, ScoreValue
+from app.api.models import (
+    Bookmaker,
+    Event,
+    GameRow,
+    Market,
+    OutcomeOdds,
+    PropRow,
+    Score,
+    ScoreValue,
+)
 
 
 class TestScore:
@@ -45,6 +54,65 @@ class TestScore:
         )
         assert score.home_score() == "-"
 
+    def test_reset_score_by_name_picks_up_new_scores(self, sample_score):
+        assert sample_score.home_score() == "55"
+        sample_score.scores = [ScoreValue(name="Lakers", score="60")]
+        sample_score.reset_score_by_name()
+        assert sample_score.home_score() == "60"
+
+    def test_model_construct_scores(self):
+        score = Score.model_construct(
+            home_team="Lakers", away_team="Celtics",
+            scores=[ScoreValue(name="Celtics", score="9")],
+        )
+        assert score.away_score() == "9"
+
+
+class TestBookmaker:
+    def test_last_update_parsed_on_access(self):
+        bm = Bookmaker.model_validate_json(
+            '{"key": "fanduel", "title": "FanDuel", "last_update": "2026-01-01T12:00:00Z"}'
+        )
+        assert bm.last_update == "2026-01-01T12:00:00Z"
+        assert bm.last_update_dt == datetime(2026, 1, 1, 12, tzinfo=timezone.utc)
+
+    def test_missing_last_update(self):
+        assert Bookmaker(key="fanduel", title="FanDuel").last_update_dt is None
+
+
+class TestEvent:
+    def _event(self) -> Event:
+        outcomes = [OutcomeOdds(name="Lakers", price=-110)]
+        return Event(
+            id="e1", sport_key="basketball_nba",
+            commence_time=datetime(2026, 1, 1, tzinfo=timezone.utc),
+            home_team="Lakers", away_team="Celtics",
+            bookmakers=[
+                Bookmaker(key="fanduel", title="FanDuel", markets=[
+                    Market(key="h2h", outcomes=outcomes),
+                    Market(key="h2h", outcomes=[]),
+                    Market(key="spreads", outcomes=[]),
+                ]),
+                Bookmaker(key="draftkings", title="DraftKings", markets=[
+                    Market(key="h2h", outcomes=outcomes),
+                ]),
+            ],
+        )
+
+    def test_market_index_groups_first_nonempty_market_per_book(self):
+        index = self._event().market_index
+        assert list(index) == ["h2h"]
+        assert [bm.key for bm, _ in index["h2h"]] == ["fanduel", "draftkings"]
+
+    def test_reset_market_index_picks_up_new_markets(self):
+        event = self._event()
+        assert "totals" not in event.market_index
+        event.bookmakers[1].markets.append(
+            Market(key="totals", outcomes=[OutcomeOdds(name="Over", price=-110, point=220.5)])
+        )
+        event.reset_market_index()
+        assert [bm.key for bm, _ in event.market_index["totals"]] == ["draftkings"]
+
 
 class TestGameRow:
     def test_default_scores(self):